@@ -5,9 +5,11 @@ Handles downloading, organizing, and tagging generated songs
 import os
 import re
 import time
+import asyncio
 import json
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -34,6 +36,19 @@ except ImportError:
     LIBROSA_AVAILABLE = False
     logger.warning("librosa not installed - audio analysis disabled")
 
+# Try to import httpx for concurrent async downloads
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    logger.warning("httpx not installed - downloads run one at a time")
+
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Referer": "https://suno.com/"
+}
+
 
 @dataclass
 class DownloadedSong:
@@ -85,27 +100,30 @@ class DownloadManager:
         self.downloaded: List[DownloadedSong] = []
         self.cookies: Dict[str, str] = {}
 
+        # One keep-alive session so TCP/TLS setup is paid once per host
+        self.session = requests.Session()
+        self.session.headers.update(REQUEST_HEADERS)
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
     def set_cookies(self, cookies: Dict[str, str]):
         """Set cookies for authenticated downloads"""
         self.cookies = cookies
+        self.session.cookies.update(cookies)
 
-    def get_audio_url(self, suno_id: str) -> Optional[str]:
-        """Get the audio URL for a SUNO song"""
+    @staticmethod
+    def _possible_urls(suno_id: str) -> List[str]:
         # SUNO audio URLs follow a pattern
-        possible_urls = [
+        return [
             f"https://cdn1.suno.ai/{suno_id}.mp3",
             f"https://cdn2.suno.ai/{suno_id}.mp3",
             f"https://audiopipe.suno.ai/?item_id={suno_id}",
         ]
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Referer": "https://suno.com/"
-        }
-
-        for url in possible_urls:
+    def get_audio_url(self, suno_id: str) -> Optional[str]:
+        """Get the audio URL for a SUNO song"""
+        for url in self._possible_urls(suno_id):
             try:
-                response = requests.head(url, headers=headers, allow_redirects=True, timeout=10)
+                response = self.session.head(url, allow_redirects=True, timeout=10)
                 if response.status_code == 200:
                     logger.info(f"Found audio URL: {url}")
                     return url
@@ -135,51 +153,128 @@ class DownloadManager:
 
         # Download the file
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-                "Referer": "https://suno.com/"
-            }
-
-            response = requests.get(audio_url, headers=headers, stream=True, timeout=60)
-            response.raise_for_status()
+            with self.session.get(audio_url, stream=True, timeout=60) as response:
+                response.raise_for_status()
 
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                with open(output_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
 
             logger.info(f"Downloaded to: {output_path}")
+            return self._finish_download(suno_id, title, genre, output_path)
 
-            # Create song record
-            song = DownloadedSong(
-                suno_id=suno_id,
-                title=title,
-                filepath=str(output_path),
-                genre=genre,
-                downloaded_at=datetime.now().isoformat()
-            )
+        except Exception as e:
+            logger.error(f"Download failed: {e}")
+            return None
+
+    def _finish_download(
+        self,
+        suno_id: str,
+        title: str,
+        genre: Optional[str],
+        output_path: Path
+    ) -> DownloadedSong:
+        """Analyze, tag, and file a freshly downloaded song"""
+        # Create song record
+        song = DownloadedSong(
+            suno_id=suno_id,
+            title=title,
+            filepath=str(output_path),
+            genre=genre,
+            downloaded_at=datetime.now().isoformat()
+        )
+
+        # Analyze audio
+        if LIBROSA_AVAILABLE:
+            self._analyze_audio(song)
+
+        # Apply ID3 tags
+        if MUTAGEN_AVAILABLE:
+            self._apply_id3_tags(song)
+
+        # Calculate quality and tier
+        self._calculate_quality(song)
+
+        # Move to appropriate tier folder if organizing by tier
+        if self.organize_by_tier and song.tier != "B":
+            song = self._move_to_tier_folder(song)
+
+        self.downloaded.append(song)
+        return song
+
+    async def get_audio_url_async(self, client: "httpx.AsyncClient", suno_id: str) -> Optional[str]:
+        """Async get_audio_url using a shared httpx client"""
+        for url in self._possible_urls(suno_id):
+            try:
+                response = await client.head(url, timeout=10)
+                if response.status_code == 200:
+                    logger.info(f"Found audio URL: {url}")
+                    return url
+            except:
+                continue
 
-            # Analyze audio
-            if LIBROSA_AVAILABLE:
-                self._analyze_audio(song)
+        return None
 
-            # Apply ID3 tags
-            if MUTAGEN_AVAILABLE:
-                self._apply_id3_tags(song)
+    async def download_song_async(
+        self,
+        client: "httpx.AsyncClient",
+        suno_id: str,
+        title: str,
+        genre: Optional[str] = None
+    ) -> Optional[DownloadedSong]:
+        """Download a single song over a shared httpx client"""
+        logger.info(f"Downloading: {title} (ID: {suno_id})")
 
-            # Calculate quality and tier
-            self._calculate_quality(song)
+        audio_url = await self.get_audio_url_async(client, suno_id)
+        if not audio_url:
+            logger.error(f"Could not find audio URL for {suno_id}")
+            return None
 
-            # Move to appropriate tier folder if organizing by tier
-            if self.organize_by_tier and song.tier != "B":
-                song = self._move_to_tier_folder(song)
+        output_path = self._get_output_path(suno_id, title, genre)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            self.downloaded.append(song)
-            return song
+        try:
+            async with client.stream("GET", audio_url, timeout=60) as response:
+                response.raise_for_status()
+                with open(output_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(64 * 1024):
+                        f.write(chunk)
+
+            logger.info(f"Downloaded to: {output_path}")
+
+            # Analysis and tagging are CPU/disk bound - keep them off the event loop
+            return await asyncio.to_thread(self._finish_download, suno_id, title, genre, output_path)
 
         except Exception as e:
             logger.error(f"Download failed: {e}")
             return None
 
+    async def download_many_async(
+        self,
+        songs: List[Dict[str, str]],
+        concurrency: int = 8
+    ) -> List[DownloadedSong]:
+        """Download songs concurrently, at most `concurrency` at a time"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with httpx.AsyncClient(
+            headers=REQUEST_HEADERS,
+            cookies=self.cookies,
+            follow_redirects=True
+        ) as client:
+            async def bounded(song_info: Dict[str, str]) -> Optional[DownloadedSong]:
+                async with semaphore:
+                    return await self.download_song_async(
+                        client,
+                        suno_id=song_info.get("suno_id", ""),
+                        title=song_info.get("title", "Untitled"),
+                        genre=song_info.get("genre")
+                    )
+
+            results = await asyncio.gather(*(bounded(s) for s in songs))
+
+        return [song for song in results if song]
+
     def _get_output_path(self, suno_id: str, title: str, genre: Optional[str]) -> Path:
         """Generate output path based on organization settings"""
         # Clean title for filename
@@ -5,8 +5,9 @@ Handles lyrics generation, style templates, and prompt optimization
 import os
 import json
 import logging
-from typing import Optional, Dict, List, Any
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from typing import Optional, Dict, List, Any, Tuple
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +21,9 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
     logger.warning("anthropic package not installed - Claude integration disabled")
 
+# Most distinct prompts create_song_prompt keeps; the least recently used go first
+PROMPT_CACHE_SIZE = 2048
+
 
 @dataclass
 class SongPrompt:
@@ -175,6 +179,9 @@ class PromptEngineer:
         else:
             logger.info("Claude integration disabled - using templates only")
 
+        # Prompts with deterministic lyrics, keyed on create_prompt's arguments
+        self._prompt_cache: "OrderedDict[Tuple, SongPrompt]" = OrderedDict()
+
     def generate_lyrics_with_claude(
         self,
         theme: str,
@@ -260,6 +267,12 @@ Together we can't go wrong
         generate_lyrics: bool = True
     ) -> SongPrompt:
         """Create a complete song prompt for SUNO"""
+        key = (title, theme, genre, mood, vocal_profile, instrumental,
+               tuple(custom_tags or ()), generate_lyrics)
+        cached = self._prompt_cache.get(key)
+        if cached is not None:
+            self._prompt_cache.move_to_end(key)
+            return replace(cached, style_tags=list(cached.style_tags))
 
         # Build style tags
         style_tags = []
@@ -292,13 +305,20 @@ Together we can't go wrong
         else:
             lyrics = ""
 
-        return SongPrompt(
+        prompt = SongPrompt(
             title=title,
             lyrics=lyrics,
             style_tags=style_tags,
             instrumental=instrumental
         )
 
+        # Claude lyrics differ per call, so only template output is reused
+        if not (generate_lyrics and not instrumental and self.client):
+            self._prompt_cache[key] = replace(prompt, style_tags=list(style_tags))
+            if len(self._prompt_cache) > PROMPT_CACHE_SIZE:
+                self._prompt_cache.popitem(last=False)
+        return prompt
+
     def create_batch_prompts(
         self,
         themes: List[Dict[str, Any]]
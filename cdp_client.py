@@ -0,0 +1,260 @@
+"""
+VLTRN SUNO DevTools Client
+Persistent Chrome DevTools Protocol connection with pipelined requests
+"""
+import json
+import logging
+import threading
+import urllib.request
+from concurrent.futures import Future, InvalidStateError
+from typing import Optional, Dict, Any, List, Callable, Iterable, Tuple
+
+logger = logging.getLogger("CDPClient")
+
+# Try to import websocket-client for the DevTools socket
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+
+
+class CDPNotSent(ConnectionError):
+    """The command never reached Chrome; a plain ConnectionError means it may already have run"""
+
+
+class CDPClient:
+    """
+    VLTRN Chrome DevTools Client
+    Keeps one WebSocket open to a page target. Every request gets its own id
+    and Future, and a reader thread resolves futures as replies arrive, so
+    any number of commands (from any thread) can be in flight at once.
+    Events (messages without an id) resolve futures from expect_event.
+    """
+
+    def __init__(self, port: int = 9222, url_contains: str = "suno.com", host: str = "127.0.0.1"):
+        self.host = host
+        self.port = port
+        self.url_contains = url_contains
+        self.ws = None
+        self.target: Optional[Dict[str, Any]] = None
+        self._next_id = 0
+        self._pending: Dict[int, Future] = {}
+        self._waiters: List[Tuple[frozenset, Optional[Callable[[Dict[str, Any]], bool]], Future]] = []
+        self._lock = threading.Lock()
+        self._reader: Optional[threading.Thread] = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.ws is not None
+
+    def list_targets(self) -> List[Dict[str, Any]]:
+        """List DevTools targets exposed on the debug port"""
+        url = f"http://{self.host}:{self.port}/json"
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return json.load(response)
+
+    def connect(self, target_id: Optional[str] = None) -> bool:
+        """Attach to target_id (False if it's gone), else the first page whose URL matches, else any page"""
+        if not WEBSOCKET_AVAILABLE:
+            logger.warning("websocket-client not installed - CDP disabled")
+            return False
+
+        try:
+            pages = [
+                t for t in self.list_targets()
+                if t.get("type") == "page" and t.get("webSocketDebuggerUrl")
+            ]
+        except Exception as e:
+            logger.warning(f"Could not reach Chrome at {self.host}:{self.port}: {e}")
+            return False
+
+        if target_id:
+            matches = [t for t in pages if t.get("id") == target_id]
+            if not matches:
+                logger.warning(f"Target {target_id} not found")
+                return False
+        else:
+            matches = [t for t in pages if self.url_contains in t.get("url", "")] or pages
+        if not matches:
+            logger.warning("No page targets available")
+            return False
+        self.target = matches[0]
+
+        try:
+            self.ws = websocket.create_connection(
+                self.target["webSocketDebuggerUrl"], suppress_origin=True
+            )
+        except Exception as e:
+            logger.warning(f"Could not open DevTools socket: {e}")
+            self.ws = None
+            return False
+
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        logger.info(f"CDP attached to {self.target.get('url')}")
+        return True
+
+    def _read_loop(self):
+        """Resolve pending futures by reply id until the socket closes"""
+        ws = self.ws
+        try:
+            while True:
+                try:
+                    raw = ws.recv()
+                except Exception:
+                    break
+                if not raw:
+                    continue
+                try:
+                    self._handle_message(json.loads(raw))
+                except Exception as e:
+                    # One bad frame must not take the reader (and every pending call) down
+                    logger.warning(f"Dropped DevTools message: {e}")
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                waiters, self._waiters = self._waiters, []
+                self.ws = None
+            for future in list(pending.values()) + [w[2] for w in waiters]:
+                self._settle(future, error=ConnectionError("CDP connection closed"))
+
+    def _handle_message(self, message: Dict[str, Any]):
+        if "id" not in message:
+            self._dispatch_event(message)
+            return
+
+        with self._lock:
+            future = self._pending.pop(message["id"], None)
+        if future is None:
+            return
+
+        if "error" in message:
+            self._settle(future, error=RuntimeError(message["error"].get("message", "CDP error")))
+        else:
+            self._settle(future, message.get("result", {}))
+
+    @staticmethod
+    def _settle(future: Future, result: Any = None, error: Optional[BaseException] = None):
+        """Resolve future unless it is already resolved or its waiter cancelled it"""
+        try:
+            if future.done() or not future.set_running_or_notify_cancel():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except (InvalidStateError, RuntimeError):
+            pass  # Lost a race with cancel()
+
+    def _dispatch_event(self, message: Dict[str, Any]):
+        """Resolve (and drop) every waiter the event satisfies"""
+        method = message.get("method")
+        params = message.get("params", {})
+        with self._lock:
+            waiters = list(self._waiters)
+
+        for methods, predicate, future in waiters:
+            if future.done() or method not in methods:
+                continue
+            try:
+                if predicate is not None and not predicate(params):
+                    continue
+            except Exception:
+                continue
+            self._settle(future, {"method": method, "params": params})
+
+        with self._lock:
+            self._waiters = [w for w in self._waiters if not w[2].done()]
+
+    def expect_event(
+        self,
+        methods: Iterable[str],
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Future:
+        """Future for the next event in `methods` whose params satisfy predicate
+
+        Register before triggering (or re-checking) whatever should fire the
+        event so it can't slip past; cancel() the future to stop waiting. The
+        domain must be enabled (e.g. Page.enable) for Chrome to send it.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self.ws is None:
+                raise ConnectionError("CDP not connected")
+            self._waiters.append((frozenset(methods), predicate, future))
+        return future
+
+    def send_async(self, method: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        """Send a command without waiting; the Future resolves to its result"""
+        future: Future = Future()
+        with self._lock:
+            if self.ws is None:
+                raise CDPNotSent("CDP not connected")
+            self._next_id += 1
+            request_id = self._next_id
+            self._pending[request_id] = future
+            try:
+                self.ws.send(json.dumps({"id": request_id, "method": method, "params": params or {}}))
+            except Exception as e:
+                del self._pending[request_id]
+                raise CDPNotSent(f"CDP send failed: {e}") from e
+        return future
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = 30) -> Dict[str, Any]:
+        """Send a command and wait for its result"""
+        return self.send_async(method, params).result(timeout)
+
+    @staticmethod
+    def _evaluate_params(expression: str, await_promise: bool) -> Dict[str, Any]:
+        return {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": await_promise
+        }
+
+    @staticmethod
+    def _value(result: Dict[str, Any]) -> Any:
+        if "exceptionDetails" in result:
+            logger.warning(f"JS exception: {result['exceptionDetails'].get('text', '')}")
+            return None
+        return result.get("result", {}).get("value")
+
+    def evaluate(self, expression: str, await_promise: bool = False, timeout: float = 30) -> Any:
+        """Evaluate JS in the page and return its value"""
+        params = self._evaluate_params(expression, await_promise)
+        return self._value(self.send("Runtime.evaluate", params, timeout))
+
+    def evaluate_many(self, expressions: List[str], timeout: float = 30) -> List[Any]:
+        """Pipeline several evaluations: all are sent before any reply is awaited"""
+        futures = [
+            self.send_async("Runtime.evaluate", self._evaluate_params(e, False))
+            for e in expressions
+        ]
+        return [self._value(f.result(timeout)) for f in futures]
+
+    def evaluate_text(self, expression: str, timeout: float = 30) -> str:
+        """Evaluate JS and format the value the way AppleScript prints it"""
+        value = self.evaluate(expression, timeout=timeout)
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return str(value)
+
+    def close(self):
+        """Close the DevTools socket (the browser keeps running)"""
+        ws = self.ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._reader is not None:
+            self._reader.join(timeout=2)
+            self._reader = None
+        self.ws = None
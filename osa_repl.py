@@ -0,0 +1,127 @@
+"""
+VLTRN SUNO osascript REPL
+One long-lived `osascript -i` session shared by the AppleScript controllers
+"""
+import json
+import subprocess
+import threading
+from typing import Optional, List, Iterable
+
+
+def applescript_string(text: str) -> str:
+    """Quoted AppleScript string literal for text, escaped in one C-level pass
+
+    JSON's quote, backslash, newline, return and tab escapes mean the same in
+    AppleScript; ensure_ascii=False keeps non-ASCII as-is, since AppleScript
+    has no \\u escape.
+    """
+    return json.dumps(text, ensure_ascii=False)
+
+
+class OsaRepl:
+    """One long-lived `osascript -i -s s`, spawned on first use
+
+    Each request goes down as one REPL line followed by a numbered sentinel
+    string; stdout is read until that sentinel comes back, so output from an
+    earlier, abandoned request can't be mistaken for ours. `-s s` prints
+    results in source form, so string results come back quoted and are
+    unquoted here; multi-line results are kept whole.
+
+    `setup` lines run after every (re)start, e.g. to load a script library
+    into a REPL variable. If the REPL dies mid-request the request is not
+    retried (it may have had effects); the next one starts a fresh REPL.
+    """
+
+    def __init__(self, setup: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._unavailable = False
+        self._request_id = 0
+        self._setup = list(setup)
+
+    def _ensure_proc(self) -> Optional[subprocess.Popen]:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        if self._unavailable:
+            return None
+        try:
+            self._proc = subprocess.Popen(
+                ["osascript", "-i", "-s", "s"],  # -s s: results in source form, strings quoted
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,  # Never read; a full pipe would stall the REPL
+                text=True,
+                bufsize=1
+            )
+        except OSError:
+            self._unavailable = True
+            self._proc = None
+            return None
+        for line in self._setup:
+            self._send(line)
+        return self._proc
+
+    @staticmethod
+    def _value(lines: List[str]) -> str:
+        """The last result the REPL printed ('=> value', possibly multi-line)"""
+        value_lines: List[str] = []
+        for line in lines:
+            line = line.rstrip('\n')
+            stripped = line.lstrip()
+            while stripped.startswith(">>"):
+                stripped = stripped[2:].lstrip()
+            if stripped.startswith("=>"):
+                value_lines = [stripped[2:].strip()]
+            elif value_lines:
+                value_lines.append(line)
+
+        value = "\n".join(value_lines).strip()
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+        return value
+
+    def _send(self, line: str) -> str:
+        """Send one REPL line and read to its sentinel; caller holds the lock"""
+        proc = self._proc
+        if proc is None:
+            return ""
+        self._request_id += 1
+        sentinel = f"@@END@@{self._request_id}@@"
+        try:
+            proc.stdin.write(f"{line}\n\"{sentinel}\"\n")
+            proc.stdin.flush()
+            lines = []
+            for output in proc.stdout:
+                if sentinel in output:
+                    return self._value(lines)
+                lines.append(output)
+        except (BrokenPipeError, OSError):
+            pass
+        self._proc = None
+        return ""
+
+    def send(self, line: str) -> Optional[str]:
+        """Run one AppleScript line on the REPL; None if there is no REPL to run it on"""
+        with self._lock:
+            if self._ensure_proc() is None:
+                return None
+            return self._send(line)
+
+    def run(self, script: str, language: str = "AppleScript") -> Optional[str]:
+        """Run a whole script via `run script`; JXA too, with language="JavaScript" """
+        command = f"run script {applescript_string(script)}"
+        if language != "AppleScript":
+            command += f' in "{language}"'
+        return self.send(command)
+
+    def close(self):
+        """Send quit to the REPL, killing it if it doesn't exit"""
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.stdin.write("quit\n")
+                proc.stdin.close()
+                proc.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                proc.kill()
@@ -3,14 +3,45 @@
 VLTRN SUNO Quick Mixer
 Fast interactive control of SUNO Studio mixing via AppleScript
 """
+import os
 import subprocess
 import time
 import sys
 import json
+from typing import Optional
+
+from cdp_client import CDPClient, CDPNotSent
+
+# Shared DevTools connection, used when VLTRN_CDP_PORT is set (see --cdp)
+_cdp: Optional[CDPClient] = None
+_cdp_failed = False
+
+
+def get_cdp() -> Optional[CDPClient]:
+    """Return the shared CDP client, connecting on first use"""
+    global _cdp, _cdp_failed
+    port = os.environ.get("VLTRN_CDP_PORT")
+    if not port or _cdp_failed:
+        return None
+    if _cdp is None:
+        _cdp = CDPClient(int(port))
+    if not _cdp.is_connected and not _cdp.connect():
+        _cdp_failed = True
+        return None
+    return _cdp
 
 
 def chrome_js(js: str) -> str:
     """Execute JavaScript in Chrome"""
+    cdp = get_cdp()
+    if cdp:
+        try:
+            return cdp.evaluate_text(js)
+        except CDPNotSent:
+            pass  # Never reached Chrome, so AppleScript can run it
+        except Exception:
+            return ""  # Timed out or failed in the page; re-running could click twice
+
     escaped = js.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
     script = f'tell application "Google Chrome" to tell active tab of front window to execute javascript "{escaped}"'
     result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
@@ -19,6 +50,8 @@ def chrome_js(js: str) -> str:
 
 def chrome_url() -> str:
     """Get current URL"""
+    if get_cdp():
+        return chrome_js("location.href")
     result = subprocess.run([
         "osascript", "-e",
         'tell application "Google Chrome" to get URL of active tab of front window'
@@ -34,6 +67,21 @@ def chrome_go(url: str):
     ], capture_output=True)
 
 
+def wait_for_page(url: str, timeout: float = 3.0) -> bool:
+    """Poll until the tab is on url and has rendered its controls, up to timeout seconds"""
+    # The page being left also has buttons, so the URL and load state come first
+    js = (
+        f'location.href.startsWith({json.dumps(url)}) && document.readyState !== "loading" && '
+        'document.querySelectorAll("button").length > 5'
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(0.1)
+        if chrome_js(js) == "true":
+            return True
+    return False
+
+
 def get_buttons() -> dict:
     """Get all buttons with their indices"""
     js = '''
@@ -92,15 +140,17 @@ def list_songs():
         var items = [];
         var all = document.querySelectorAll("*");
         for (var el of all) {
-            var t = el.innerText;
-            if (t && (t.includes("BPM") || t.includes("major") || t.includes("minor"))) {
-                if (t.length < 100 && t.length > 5) {
-                    var clean = t.replace(/\\n/g, " ").substring(0, 80);
-                    if (!items.includes(clean)) items.push(clean);
-                }
+            if (items.length >= 10) break;
+            /* textContent avoids the layout flush innerText forces per element */
+            var t = el.textContent;
+            if (t && t.length < 100 && t.length > 5 &&
+                (t.includes("BPM") || t.includes("major") || t.includes("minor")) &&
+                getComputedStyle(el).display !== "none") {
+                var clean = t.replace(/\\s+/g, " ").trim().substring(0, 80);
+                if (!items.includes(clean)) items.push(clean);
             }
         }
-        return items.slice(0, 10).join("\\n");
+        return items.join("\\n");
     })()
     '''
     return chrome_js(js)
@@ -110,6 +160,20 @@ def get_tracks() -> list:
     """Get list of tracks in Studio project"""
     js = '''
     (function() {
+        /* Prefer the structured track rows; only fall back to scraping the
+           rendered page text (which needs innerText line breaks) if absent */
+        var rows = document.querySelectorAll('[class*="TrackRow"], [data-testid*="track-row"]');
+        if (rows.length > 0) {
+            var rowTracks = [];
+            for (var r = 0; r < rows.length; r++) {
+                if (getComputedStyle(rows[r]).display === "none") continue;
+                var nameEl = rows[r].querySelector('[class*="TrackName"], [data-testid*="track-name"]');
+                var name = nameEl ? nameEl.textContent.trim() : "";
+                rowTracks.push({num: rowTracks.length + 1, name: name || "Track " + (rowTracks.length + 1)});
+            }
+            if (rowTracks.length > 0) return JSON.stringify(rowTracks);
+        }
+
         var text = document.body.innerText;
         var idx = text.indexOf("Untitled Project");
         if (idx < 0) idx = text.indexOf("Project");
@@ -275,17 +339,24 @@ Utility:
 
 
 def main():
+    if "--cdp" in sys.argv:
+        os.environ.setdefault("VLTRN_CDP_PORT", "9222")
+
     print("=" * 50)
     print("VLTRN SUNO Quick Mixer")
     print("=" * 50)
 
-    url = chrome_url()
-    print(f"Connected to: {url}")
+    # Skip the startup URL probe when the caller knows Chrome is already on SUNO
+    if "--no-check" in sys.argv or os.environ.get("VLTRN_NO_CHECK"):
+        print("Skipping Chrome URL check")
+    else:
+        url = chrome_url()
+        print(f"Connected to: {url}")
 
-    if "suno.com" not in url:
-        print("Not on SUNO - navigating to Studio...")
-        chrome_go("https://suno.com/studio")
-        time.sleep(3)
+        if "suno.com" not in url:
+            print("Not on SUNO - navigating to Studio...")
+            chrome_go("https://suno.com/studio")
+            wait_for_page("https://suno.com/studio")
 
     print_help()
 
@@ -311,12 +382,12 @@ def main():
 
             elif action == "studio":
                 chrome_go("https://suno.com/studio")
-                time.sleep(2)
+                wait_for_page("https://suno.com/studio", 2)
                 print("Navigated to Studio")
 
             elif action == "library":
                 chrome_go("https://suno.com/me")
-                time.sleep(2)
+                wait_for_page("https://suno.com/me", 2)
                 print("Navigated to Library")
 
             elif action == "text":
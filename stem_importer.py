@@ -3,73 +3,309 @@
 VLTRN SUNO Stem Importer
 Automates importing audio stems into SUNO Studio tracks
 """
+import asyncio
+import hashlib
 import subprocess
 import time
 import json
 import os
+import re
+import shutil
+import sys
+import argparse
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
+
+from cdp_client import CDPClient, CDPNotSent
+from osa_repl import OsaRepl, applescript_string
+
+# Optional in-process header readers; ffprobe is used when they're missing
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):  # OSError: libsndfile itself not found
+    SOUNDFILE_AVAILABLE = False
+
+try:
+    import mutagen
+    MUTAGEN_AVAILABLE = True
+except ImportError:
+    MUTAGEN_AVAILABLE = False
+
+# Optional C Aho-Corasick matcher for detect_stem_type (pyahocorasick)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 BASE_DIR = Path(__file__).parent
 STEMS_DIR = BASE_DIR / "stems"
 STEMS_DIR.mkdir(exist_ok=True)
+STEMS_DIR_STR = str(STEMS_DIR)  # For os.path joins in per-file loops
+
+AUDIO_EXTENSIONS = frozenset({'.wav', '.mp3', '.aiff', '.flac', '.m4a', '.ogg'})
+
+# Canonical RIFF/WAVE header: RIFF chunk, 16-byte fmt chunk, data chunk header
+WAV_HEADER_SIZE = 44
+
+# soundfile subtypes as PCM bit depths
+SOUNDFILE_BITS = {'PCM_S8': 8, 'PCM_U8': 8, 'PCM_16': 16, 'PCM_24': 24, 'PCM_32': 32}
+
+# AIFF-C compression types that are plain PCM, by byte order
+AIFF_PCM_ENDIAN = {b'NONE': 'be', b'twos': 'be', b'sowt': 'le'}
+
+# PCM that can be stream-copied into a WAV container as-is
+WAV_COPY_CODECS = frozenset({'pcm_s16le', 'pcm_s24le'})
+
+# Parallel ffmpeg conversions in prepare_stems
+DEFAULT_CONVERT_CONCURRENCY = min(os.cpu_count() or 1, 4)
+
+# AppleScript command templates, built once at import
+RUN_JS_SCRIPT = 'tell application "Google Chrome" to tell active tab of front window to execute javascript "{}"'
+GET_URL_SCRIPT = 'tell application "Google Chrome" to get URL of active tab of front window'
+NAVIGATE_SCRIPT = 'tell application "Google Chrome" to set URL of active tab of front window to "{}"'
+KEYSTROKE_SCRIPT = 'tell application "System Events" to tell process "Google Chrome" to keystroke "{}"'
+CLICK_SCRIPT = 'tell application "System Events" to click at {{{}, {}}}'
+
+# Handler library compiled once with osacompile (see ChromeController._compile_library).
+# `osascript chrome.scpt <handler> <args...>` runs it without re-parsing
+# source; the REPL loads it once and calls the handlers directly.
+CHROME_LIBRARY_SOURCE = '''
+on run argv
+    set handlerName to item 1 of argv
+    if handlerName is "runJS" then return runJS(item 2 of argv)
+    if handlerName is "getURL" then return getURL()
+    if handlerName is "navigate" then navigate(item 2 of argv)
+    if handlerName is "typeKey" then typeKey(item 2 of argv, item 3 of argv)
+    if handlerName is "clickAt" then clickAt(item 2 of argv, item 3 of argv)
+    return ""
+end run
+
+on runJS(js)
+    tell application "Google Chrome" to tell active tab of front window to return (execute javascript js)
+end runJS
+
+on getURL()
+    tell application "Google Chrome" to return URL of active tab of front window
+end getURL
+
+on navigate(targetURL)
+    tell application "Google Chrome" to set URL of active tab of front window to targetURL
+end navigate
+
+on typeKey(theKey, modifiers)
+    tell application "System Events"
+        set modifierList to {}
+        if modifiers contains "command" then set end of modifierList to command down
+        if modifiers contains "shift" then set end of modifierList to shift down
+        if modifiers contains "option" then set end of modifierList to option down
+        if modifiers contains "control" then set end of modifierList to control down
+        tell process "Google Chrome"
+            if modifierList is {} then
+                keystroke theKey
+            else
+                keystroke theKey using modifierList
+            end if
+        end tell
+    end tell
+end typeKey
+
+on clickAt(x, y)
+    tell application "System Events" to click at {x as integer, y as integer}
+end clickAt
+'''
+LIBRARY_CACHE_DIR = Path.home() / ".cache" / "vltrn"
+LIBRARY_NAME = "vltrnChrome"  # Variable the REPL keeps the loaded library in
 
 
 class ChromeController:
-    """Control Chrome via AppleScript"""
+    """Control Chrome via AppleScript
+
+    Commands are written to one long-lived ``osascript -i`` process (the
+    shared OsaRepl) instead of spawning osascript per call; if that process
+    can't be started each command falls back to a one-off osascript run. Both paths call into
+    a precompiled handler library when osacompile is available.
+
+    Given a connected CDPClient, page JS and navigation go over DevTools
+    instead; keystrokes and clicks always use System Events.
+    """
+
+    def __init__(self, cdp: Optional[CDPClient] = None):
+        self.cdp = cdp
+        self._library: Optional[str] = self._compile_library()
+        # The library is (re)loaded into a REPL variable whenever the REPL starts
+        setup = []
+        if self._library:
+            setup.append(f'set {LIBRARY_NAME} to load script POSIX file {self._literal(self._library)}')
+        self._repl = OsaRepl(setup)
+        self._library_loaded = bool(self._library) and self._repl.send(f"class of {LIBRARY_NAME}") == "script"
 
     @staticmethod
-    def run_js(js: str) -> str:
-        escaped = js.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
-        script = f'tell application "Google Chrome" to tell active tab of front window to execute javascript "{escaped}"'
-        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
-        return result.stdout.strip()
+    def _compile_library() -> Optional[str]:
+        """Compile CHROME_LIBRARY_SOURCE to a cached .scpt, once per source version"""
+        digest = hashlib.sha1(CHROME_LIBRARY_SOURCE.encode()).hexdigest()[:12]
+        path = LIBRARY_CACHE_DIR / f"chrome-{digest}.scpt"
+        if path.exists():
+            return str(path)
+        if not shutil.which("osacompile"):
+            return None
 
-    @staticmethod
-    def get_url() -> str:
-        result = subprocess.run([
-            "osascript", "-e",
-            'tell application "Google Chrome" to get URL of active tab of front window'
-        ], capture_output=True, text=True)
-        return result.stdout.strip()
+        try:
+            LIBRARY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            source = path.with_suffix(".applescript")
+            source.write_text(CHROME_LIBRARY_SOURCE)
+            result = subprocess.run(
+                ["osacompile", "-o", str(path), str(source)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            source.unlink()
+        except OSError:
+            return None
+        return str(path) if result.returncode == 0 else None
 
     @staticmethod
-    def navigate(url: str):
-        subprocess.run([
-            "osascript", "-e",
-            f'tell application "Google Chrome" to set URL of active tab of front window to "{url}"'
-        ], capture_output=True)
+    def _literal(value) -> str:
+        """AppleScript literal for a handler argument"""
+        if isinstance(value, int):
+            return str(value)
+        return applescript_string(str(value))
 
     @staticmethod
-    def keystroke(key: str, modifiers: str = ""):
+    def _osascript(args: List[str], capture: bool) -> str:
+        """One-off osascript; output the caller won't read goes to DEVNULL"""
+        if not capture:
+            subprocess.run(["osascript", *args], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return ""
+        result = subprocess.run(["osascript", *args], capture_output=True, text=True)
+        return result.stdout.strip()
+
+    def run_script(self, script: str, capture: bool = True) -> str:
+        """Run a single-line AppleScript and return its result"""
+        result = self._repl.send(script)
+        if result is not None:
+            return result
+        return self._osascript(["-e", script], capture)
+
+    def _call(self, handler: str, *args, capture: bool = True) -> Optional[str]:
+        """Call a compiled library handler; None if the library is unavailable"""
+        if not self._library:
+            return None
+
+        if self._library_loaded:
+            call = f"tell {LIBRARY_NAME} to {handler}({', '.join(map(self._literal, args))})"
+            result = self._repl.send(call)
+            if result is not None:
+                return result
+
+        # Arguments go through argv as-is - no escaping needed
+        return self._osascript([self._library, handler, *map(str, args)], capture)
+
+    def _use_cdp(self) -> bool:
+        return self.cdp is not None and self.cdp.is_connected
+
+    def run_js(self, js: str) -> str:
+        if self._use_cdp():
+            try:
+                return self.cdp.evaluate_text(js)
+            except CDPNotSent:
+                pass  # Never reached Chrome, so AppleScript can run it
+            except Exception:
+                return ""  # Timed out or failed in the page; re-running could click twice
+
+        result = self._call("runJS", js)
+        if result is not None:
+            return result
+
+        escaped = js.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+        return self.run_script(RUN_JS_SCRIPT.format(escaped))
+
+    def run_js_batch(self, snippets: Dict[str, str]) -> Dict[str, str]:
+        """Evaluate several JS expressions in a single osascript round-trip"""
+        body = ", ".join(f"{json.dumps(key)}: ({js})" for key, js in snippets.items())
+        result = self.run_js(f"JSON.stringify({{{body}}})")
+        try:
+            values = json.loads(result)
+        except ValueError:
+            return {key: "" for key in snippets}
+        return {key: "" if values.get(key) is None else str(values[key]) for key in snippets}
+
+    def get_url(self) -> str:
+        if self._use_cdp():
+            return self.run_js("location.href")
+        result = self._call("getURL")
+        if result is not None:
+            return result
+        return self.run_script(GET_URL_SCRIPT)
+
+    def navigate(self, url: str):
+        if self._use_cdp():
+            try:
+                self.cdp.send("Page.navigate", {"url": url})
+                return
+            except CDPNotSent:
+                pass
+            except Exception:
+                return
+        if self._call("navigate", url, capture=False) is None:
+            self.run_script(NAVIGATE_SCRIPT.format(url), capture=False)
+
+    def keystroke(self, key: str, modifiers: str = ""):
         """Send keystroke to Chrome"""
+        if self._call("typeKey", key, modifiers, capture=False) is not None:
+            return
+        script = KEYSTROKE_SCRIPT.format(key)
         if modifiers:
-            script = f'''
-            tell application "System Events"
-                tell process "Google Chrome"
-                    keystroke "{key}" using {modifiers}
-                end tell
-            end tell
-            '''
-        else:
-            script = f'''
-            tell application "System Events"
-                tell process "Google Chrome"
-                    keystroke "{key}"
-                end tell
-            end tell
-            '''
-        subprocess.run(["osascript", "-e", script], capture_output=True)
+            script += f" using {modifiers}"
+        self.run_script(script, capture=False)
 
-    @staticmethod
-    def click_coordinates(x: int, y: int):
+    def click_coordinates(self, x: int, y: int):
         """Click at specific screen coordinates"""
-        script = f'''
-        tell application "System Events"
-            click at {{{x}, {y}}}
-        end tell
-        '''
-        subprocess.run(["osascript", "-e", script], capture_output=True)
+        if self._call("clickAt", x, y, capture=False) is None:
+            self.run_script(CLICK_SCRIPT.format(x, y), capture=False)
+
+    def close(self):
+        """Shut down the osascript REPL and DevTools socket"""
+        if self.cdp is not None:
+            self.cdp.close()
+        self._repl.close()
+
+
+# Filename fragments per stem type, checked in order (first match wins)
+STEM_PATTERNS = {
+    'vocals': ['vocal', 'vox', 'voice', 'sing', 'lead_vocal'],
+    'backing_vocals': ['backing', 'bv', 'harmony', 'choir', 'back_vocal'],
+    'drums': ['drum', 'beat', 'kick', 'snare', 'hihat', 'percussion'],
+    'bass': ['bass', 'sub', 'low'],
+    'guitar': ['guitar', 'gtr', 'acoustic', 'electric_guitar'],
+    'keyboard': ['keys', 'keyboard', 'piano', 'synth', 'organ', 'rhodes'],
+    'strings': ['string', 'violin', 'cello', 'orchestra', 'orchestral'],
+    'brass': ['brass', 'trumpet', 'horn', 'trombone', 'sax'],
+    'fx': ['fx', 'effect', 'sfx', 'ambient', 'atmosphere'],
+    'other': []
+}
+
+# One alternation per stem type, so each type is a single regex scan
+_STEM_REGEXES: List[Tuple[str, re.Pattern]] = [
+    (stem_type, re.compile("|".join(map(re.escape, patterns))))
+    for stem_type, patterns in STEM_PATTERNS.items() if patterns
+]
+
+
+def _build_stem_automaton():
+    """All fragments in one automaton; values carry the type's priority"""
+    automaton = ahocorasick.Automaton()
+    for priority, (stem_type, patterns) in enumerate(STEM_PATTERNS.items()):
+        for pattern in patterns:
+            if not automaton.exists(pattern):  # Earlier type keeps a shared fragment
+                automaton.add_word(pattern, (priority, stem_type))
+    automaton.make_automaton()
+    return automaton
+
+
+_STEM_AUTOMATON = _build_stem_automaton() if AHOCORASICK_AVAILABLE else None
 
 
 class StemAnalyzer:
@@ -78,6 +314,119 @@ class StemAnalyzer:
     @staticmethod
     def analyze_file(file_path: str) -> Dict:
         """Get audio file properties"""
+        try:
+            info = StemAnalyzer._read_header(file_path)
+            if info:
+                return info
+        except Exception:
+            pass
+        return StemAnalyzer._probe_file(file_path)
+
+    @staticmethod
+    def _read_header(file_path: str) -> Optional[Dict]:
+        """Read audio properties in-process with soundfile/mutagen"""
+        ext = os.path.splitext(file_path)[1].lower()
+
+        if SOUNDFILE_AVAILABLE and ext in ('.wav', '.aiff', '.aif'):
+            info = sf.info(file_path)
+            duration = info.duration
+            bitrate = int(os.path.getsize(file_path) * 8 / duration) // 1000 if duration else 0
+            sample_rate, channels = info.samplerate, info.channels
+            bits = SOUNDFILE_BITS.get(info.subtype, 0)
+            # Only AIFF needs a codec: non-48kHz WAV is resampled, the rest linked
+            codec_name = None if ext == '.wav' else StemAnalyzer._aiff_codec(file_path)
+        elif MUTAGEN_AVAILABLE:
+            audio = mutagen.File(file_path)
+            if audio is None or audio.info is None:
+                return None
+            duration = audio.info.length
+            sample_rate = getattr(audio.info, 'sample_rate', 0)
+            channels = getattr(audio.info, 'channels', 0)
+            bitrate = getattr(audio.info, 'bitrate', 0) // 1000
+            bits = getattr(audio.info, 'bits_per_sample', 0)
+            codec_name = None
+        else:
+            return None
+
+        return {
+            'path': file_path,
+            'filename': os.path.basename(file_path),
+            'duration': float(duration),
+            'sample_rate': int(sample_rate),
+            'channels': channels,
+            'bitrate': bitrate,
+            'bits_per_sample': bits,
+            'format': ext.lstrip('.'),
+            'codec_name': codec_name
+        }
+
+    @staticmethod
+    def _aiff_codec(file_path: str) -> Optional[str]:
+        """ffmpeg codec name of an AIFF/AIFF-C file's PCM, from its COMM chunk"""
+        with open(file_path, 'rb') as f:
+            form = f.read(12)
+            if len(form) < 12 or form[:4] != b'FORM' or form[8:12] not in (b'AIFF', b'AIFC'):
+                return None
+            while True:
+                chunk = f.read(8)
+                if len(chunk) < 8:
+                    return None
+                chunk_id, size = struct.unpack('>4sI', chunk)
+                if chunk_id == b'COMM':
+                    break
+                f.seek(size + (size & 1), os.SEEK_CUR)  # Chunks are padded to even length
+            comm = f.read(size)
+
+        bits = struct.unpack_from('>H', comm, 6)[0]
+        compression = comm[18:22] if form[8:12] == b'AIFC' else b'NONE'
+        endian = AIFF_PCM_ENDIAN.get(compression)
+        if endian is None or bits not in (16, 24):
+            return None
+        return f'pcm_s{bits}{endian}'
+
+    @staticmethod
+    def sniff_file(file_path: str) -> Optional[Dict]:
+        """Read WAV properties from the first header bytes; None if not a WAV"""
+        try:
+            with open(file_path, 'rb') as f:
+                header = f.read(WAV_HEADER_SIZE)
+            return StemAnalyzer._parse_wave(header, file_path, os.path.getsize(file_path))
+        except (OSError, struct.error):
+            return None
+
+    @staticmethod
+    def _parse_wave(header: bytes, file_path: str, file_size: int) -> Optional[Dict]:
+        if len(header) < WAV_HEADER_SIZE or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return None
+        if header[12:16] != b'fmt ':
+            return None
+
+        fmt_size, _, channels, sample_rate, byte_rate = struct.unpack_from('<IHHII', header, 16)
+        bits = struct.unpack_from('<H', header, 34)[0]
+        if not (channels and sample_rate and byte_rate):
+            return None
+
+        if fmt_size == 16 and header[36:40] == b'data':
+            data_size = struct.unpack_from('<I', header, 40)[0]
+        else:
+            # Extended fmt chunk or extra chunks first; estimate from file size
+            data_size = file_size - WAV_HEADER_SIZE
+
+        return {
+            'path': file_path,
+            'filename': os.path.basename(file_path),
+            'duration': data_size / byte_rate,
+            'sample_rate': sample_rate,
+            'channels': channels,
+            'bitrate': byte_rate * 8 // 1000,
+            'bits_per_sample': bits,
+            'format': 'wav',
+            'codec_name': None
+        }
+
+    @staticmethod
+    def _probe_file(file_path: str) -> Dict:
+        """Get audio file properties from ffprobe"""
         cmd = [
             'ffprobe', '-v', 'quiet', '-print_format', 'json',
             '-show_format', '-show_streams', file_path
@@ -94,55 +443,236 @@ class StemAnalyzer:
                 'sample_rate': int(stream.get('sample_rate', 0)),
                 'channels': stream.get('channels', 0),
                 'bitrate': int(fmt.get('bit_rate', 0)) // 1000,
-                'format': fmt.get('format_name', 'unknown')
+                'bits_per_sample': int(stream.get('bits_per_raw_sample') or stream.get('bits_per_sample') or 0),
+                'format': fmt.get('format_name', 'unknown'),
+                'codec_name': stream.get('codec_name')
             }
         return {'path': file_path, 'error': 'Could not analyze'}
 
     @staticmethod
-    def convert_to_suno_format(input_file: str, output_file: str) -> bool:
+    def is_suno_compliant(info: Dict, file_path: str) -> bool:
+        """True if the file is already WAV 48kHz stereo"""
+        return (
+            info.get('sample_rate') == 48000 and
+            info.get('channels') == 2 and
+            file_path.lower().endswith('.wav')
+        )
+
+    @staticmethod
+    def can_remux(info: Dict) -> bool:
+        """True if the audio is 48kHz stereo little-endian PCM - only the container differs"""
+        return (
+            info.get('sample_rate') == 48000 and
+            info.get('channels') == 2 and
+            info.get('codec_name') in WAV_COPY_CODECS
+        )
+
+    @staticmethod
+    def convert_to_suno_format(input_file: str, output_file: str, info: Optional[Dict] = None) -> bool:
         """Convert audio to SUNO-compatible format (WAV 48kHz stereo)"""
-        cmd = [
-            'ffmpeg', '-y', '-i', input_file,
-            '-ar', '48000',     # 48kHz sample rate
-            '-ac', '2',         # Stereo
-            '-acodec', 'pcm_s16le',  # 16-bit PCM
-            output_file
-        ]
-        result = subprocess.run(cmd, capture_output=True)
-        return result.returncode == 0
+        return asyncio.run(StemAnalyzer.convert_async(input_file, output_file, info))
+
+    @staticmethod
+    async def convert_async(input_file: str, output_file: str, info: Optional[Dict] = None) -> bool:
+        """Run the ffmpeg conversion without blocking the event loop
+
+        Pass the file's `analyze_file` info if known to skip re-analyzing it.
+        """
+        if info is None:
+            info = await asyncio.to_thread(StemAnalyzer.analyze_file, input_file)
+
+        # Already compliant: link (or copy) instead of re-encoding
+        if StemAnalyzer.is_suno_compliant(info, input_file):
+            return StemAnalyzer._link_or_copy(input_file, output_file)
+
+        if StemAnalyzer.can_remux(info):
+            codec_args = ['-c:a', 'copy', '-f', 'wav']   # e.g. AIFF-C 'sowt': rewrap only
+        else:
+            codec_args = [
+                '-ar', '48000',     # 48kHz sample rate
+                '-ac', '2',         # Stereo
+                # 16-bit PCM; 24-bit sources keep their depth (WAV takes either)
+                '-acodec', 'pcm_s24le' if info.get('bits_per_sample') == 24 else 'pcm_s16le',
+            ]
+
+        proc = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-y', '-nostats', '-loglevel', 'error',
+            '-i', input_file,
+            '-threads', '0',    # Let ffmpeg use every core
+            *codec_args,
+            output_file,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        return await proc.wait() == 0
+
+    @staticmethod
+    def _link_or_copy(input_file: str, output_file: str) -> bool:
+        try:
+            if os.path.lexists(output_file):
+                os.remove(output_file)
+            try:
+                os.link(input_file, output_file)
+            except OSError:  # Different filesystem, or links unsupported
+                shutil.copyfile(input_file, output_file)
+            return True
+        except OSError:
+            return False
 
     @staticmethod
     def detect_stem_type(filename: str) -> str:
         """Guess stem type from filename"""
         name = filename.lower()
 
-        stem_patterns = {
-            'vocals': ['vocal', 'vox', 'voice', 'sing', 'lead_vocal'],
-            'backing_vocals': ['backing', 'bv', 'harmony', 'choir', 'back_vocal'],
-            'drums': ['drum', 'beat', 'kick', 'snare', 'hihat', 'percussion'],
-            'bass': ['bass', 'sub', 'low'],
-            'guitar': ['guitar', 'gtr', 'acoustic', 'electric_guitar'],
-            'keyboard': ['keys', 'keyboard', 'piano', 'synth', 'organ', 'rhodes'],
-            'strings': ['string', 'violin', 'cello', 'orchestra', 'orchestral'],
-            'brass': ['brass', 'trumpet', 'horn', 'trombone', 'sax'],
-            'fx': ['fx', 'effect', 'sfx', 'ambient', 'atmosphere'],
-            'other': []
-        }
-
-        for stem_type, patterns in stem_patterns.items():
-            for pattern in patterns:
-                if pattern in name:
-                    return stem_type
+        if _STEM_AUTOMATON is not None:
+            # One pass over the name; the highest-priority type matched wins
+            best = min((value for _, value in _STEM_AUTOMATON.iter(name)), default=None)
+            return best[1] if best else 'other'
 
+        for stem_type, regex in _STEM_REGEXES:
+            if regex.search(name):
+                return stem_type
         return 'other'
 
 
+# Page-side JS shared by single calls and batched snapshots
+
+# Called with the fingerprint of the last parsed page; when it still matches,
+# only the fingerprint comes back and the scrape is skipped. Track rows are
+# read straight from the DOM, with the page-text scan kept as a fallback.
+TRACKS_JS = '''
+function(knownFp) {
+    var studio = window.SunoStudio && window.SunoStudio.state;
+    var fp = document.body.textContent.length + "_" + ((studio && studio.projectId) || "") + "_" + location.pathname;
+    if (fp === knownFp) return JSON.stringify({fp: fp});
+
+    var rows = document.querySelectorAll('[class*="TrackRow"], [data-testid*="track-row"]');
+    if (rows.length > 0) {
+        var rowTracks = Array.from(rows).map(function(el, i) {
+            var nameEl = el.querySelector('[class*="TrackName"], [data-testid*="track-name"]');
+            var name = nameEl && nameEl.textContent.trim();
+            return {num: i + 1, name: name || "Track " + (i + 1)};
+        });
+        return JSON.stringify({fp: fp, tracks: rowTracks});
+    }
+
+    var text = document.body.innerText;
+    var idx = text.indexOf("Project");
+    if (idx < 0) return JSON.stringify({fp: fp, tracks: []});
+
+    var section = text.substring(idx, idx + 1500);
+    var lines = section.split(String.fromCharCode(10));
+    var tracks = [];
+    var trackNum = 0;
+    var skipWords = ["S", "M", "Muted", "No Input", "Add Track", "Create", "Drop Here", "Clip", "Track", "Untitled Project", "Project"];
+
+    for (var i = 0; i < lines.length; i++) {
+        var line = lines[i].trim();
+        if (line.length > 0 && line.length < 4 && !isNaN(parseInt(line))) {
+            trackNum = parseInt(line);
+        } else if (trackNum > 0 && line.length > 1 && line.length < 30 &&
+                   skipWords.indexOf(line) === -1) {
+            tracks.push({num: trackNum, name: line});
+            trackNum = 0;
+        }
+    }
+    return JSON.stringify({fp: fp, tracks: tracks});
+}
+'''
+
+DROP_HINT_JS = '''
+(function() {
+    var dropZones = document.querySelectorAll("[class*='drop'], [class*='Drop'], [data-testid*='drop']");
+    if (dropZones.length > 0) {
+        return "Drop zones found: " + dropZones.length;
+    }
+
+    var text = document.body.innerText;
+    if (text.includes("Drop Here") || text.includes("drag")) {
+        return "Drag and drop supported";
+    }
+
+    return "Manual import may be required";
+})()
+'''
+
+# Button lookups run as one native XPath query instead of a JS loop over
+# every button; translate() is XPath 1.0's lowercase
+def _lower(expr: str) -> str:
+    return f"translate({expr}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+
+ADD_TRACK_XPATH = "//button[contains(., 'Add Track')]"
+LIBRARY_XPATH = f"//button[contains({_lower('.')}, 'library')]"
+IMPORT_XPATH = (
+    "//*[self::button or @role='button']["
+    f"contains({_lower('.')}, 'import') or contains({_lower('.')}, 'upload') or "
+    f"contains({_lower('@aria-label')}, 'import') or contains({_lower('@aria-label')}, 'upload')]"
+)
+
+
+def _first_xpath_js(xpath: str) -> str:
+    """JS expression for the first element matching xpath, or null"""
+    return (
+        f"document.evaluate({json.dumps(xpath)}, document, null, "
+        "XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue"
+    )
+
+
+def _click_xpath_js(xpath: str, done: str) -> str:
+    """JS that clicks the first element matching xpath and returns `done`"""
+    return f'''
+(function() {{
+    var el = {_first_xpath_js(xpath)};
+    if (el) {{
+        el.click();
+        return "{done}";
+    }}
+    return "not found";
+}})()
+'''
+
+
+ADD_TRACK_JS = _click_xpath_js(ADD_TRACK_XPATH, "added")
+OPEN_LIBRARY_JS = _click_xpath_js(LIBRARY_XPATH, "opened")
+
+CLICK_IMPORT_JS = f'''
+(function() {{
+    var el = {_first_xpath_js(IMPORT_XPATH)};
+    if (el) {{
+        el.click();
+        return "clicked";
+    }}
+
+    /* Try file input */
+    var inputs = document.querySelectorAll("input[type='file']");
+    for (var inp of inputs) {{
+        if (inp.offsetParent !== null) {{
+            inp.click();
+            return "file input clicked";
+        }}
+    }}
+
+    return "not found";
+}})()
+'''
+
+IMPORT_PROBE_JS = f'''
+(function() {{
+    if ({_first_xpath_js(IMPORT_XPATH)}) return "found";
+    return document.querySelector("input[type='file']") ? "found" : "not found";
+}})()
+'''
+
+
 class SunoStudioImporter:
     """Import stems into SUNO Studio"""
 
-    def __init__(self):
-        self.chrome = ChromeController()
+    def __init__(self, chrome: Optional[ChromeController] = None):
+        self.chrome = chrome or ChromeController()
         self.analyzer = StemAnalyzer()
+        # (page fingerprint, tracks parsed from that page)
+        self._tracks_cache: Tuple[str, List[Dict]] = ("", [])
 
     def ensure_studio(self) -> bool:
         """Make sure we're in SUNO Studio"""
@@ -156,206 +686,179 @@ class SunoStudioImporter:
 
     def get_current_tracks(self) -> List[Dict]:
         """Get list of tracks in current project"""
-        js = '''
-        (function() {
-            var text = document.body.innerText;
-            var idx = text.indexOf("Project");
-            if (idx < 0) return "[]";
-
-            var section = text.substring(idx, idx + 1500);
-            var lines = section.split(String.fromCharCode(10));
-            var tracks = [];
-            var trackNum = 0;
-            var skipWords = ["S", "M", "Muted", "No Input", "Add Track", "Create", "Drop Here", "Clip", "Track", "Untitled Project", "Project"];
-
-            for (var i = 0; i < lines.length; i++) {
-                var line = lines[i].trim();
-                if (line.length > 0 && line.length < 4 && !isNaN(parseInt(line))) {
-                    trackNum = parseInt(line);
-                } else if (trackNum > 0 && line.length > 1 && line.length < 30 &&
-                           skipWords.indexOf(line) === -1) {
-                    tracks.push({num: trackNum, name: line});
-                    trackNum = 0;
-                }
-            }
-            return JSON.stringify(tracks);
-        })()
-        '''
-        result = self.chrome.run_js(js)
+        return self._parse_tracks(self.chrome.run_js(self._tracks_js()))
+
+    def _tracks_js(self) -> str:
+        return f"({TRACKS_JS})({json.dumps(self._tracks_cache[0])})"
+
+    def _parse_tracks(self, result: str) -> List[Dict]:
         try:
-            return json.loads(result)
+            envelope = json.loads(result)
         except:
             return []
+        if not isinstance(envelope, dict):
+            return []
+        if 'tracks' not in envelope:
+            return self._tracks_cache[1]  # Page unchanged since last parse
+
+        self._tracks_cache = (envelope.get('fp', ''), envelope['tracks'])
+        return envelope['tracks']
+
+    def invalidate_tracks(self):
+        """Drop the cached track list so the next read re-scrapes"""
+        self._tracks_cache = ("", [])
 
     def add_track(self) -> bool:
         """Add a new track to the project"""
-        js = '''
-        (function() {
-            var btns = document.querySelectorAll("button");
-            for (var btn of btns) {
-                if (btn.textContent.includes("Add Track")) {
-                    btn.click();
-                    return "added";
-                }
-            }
-            return "not found";
-        })()
-        '''
-        result = self.chrome.run_js(js)
+        result = self.chrome.run_js(ADD_TRACK_JS)
+        self.invalidate_tracks()
         return "added" in result
 
     def select_track(self, track_num: int) -> bool:
         """Select a track by number"""
-        js = f'''
-        (function() {{
-            var btns = document.querySelectorAll("button");
-            for (var btn of btns) {{
-                if (btn.textContent.trim() === "{track_num}") {{
-                    btn.click();
-                    return "selected";
-                }}
-            }}
-            return "not found";
-        }})()
-        '''
+        js = _click_xpath_js(f"//button[normalize-space(.)='{track_num}']", "selected")
         result = self.chrome.run_js(js)
+        self.invalidate_tracks()
         return "selected" in result
 
     def open_library(self) -> bool:
         """Open the song/audio library"""
-        js = '''
-        (function() {
-            var btns = document.querySelectorAll("button");
-            for (var btn of btns) {
-                var text = btn.textContent.toLowerCase();
-                if (text.includes("library") || text.includes("open library")) {
-                    btn.click();
-                    return "opened";
-                }
-            }
-            return "not found";
-        })()
-        '''
-        result = self.chrome.run_js(js)
+        result = self.chrome.run_js(OPEN_LIBRARY_JS)
         return "opened" in result
 
     def click_import(self) -> bool:
         """Click import/upload button"""
-        js = '''
-        (function() {
-            var btns = document.querySelectorAll("button, [role='button']");
-            for (var btn of btns) {
-                var text = btn.textContent.toLowerCase();
-                var label = (btn.getAttribute("aria-label") || "").toLowerCase();
-                if (text.includes("import") || text.includes("upload") ||
-                    label.includes("import") || label.includes("upload")) {
-                    btn.click();
-                    return "clicked";
-                }
-            }
-
-            // Try file input
-            var inputs = document.querySelectorAll("input[type='file']");
-            for (var inp of inputs) {
-                if (inp.offsetParent !== null) {
-                    inp.click();
-                    return "file input clicked";
-                }
-            }
-
-            return "not found";
-        })()
-        '''
-        result = self.chrome.run_js(js)
+        result = self.chrome.run_js(CLICK_IMPORT_JS)
         return "clicked" in result
 
     def drag_and_drop_hint(self) -> str:
         """Get hint about drag-and-drop area"""
-        js = '''
-        (function() {
-            var dropZones = document.querySelectorAll("[class*='drop'], [class*='Drop'], [data-testid*='drop']");
-            if (dropZones.length > 0) {
-                return "Drop zones found: " + dropZones.length;
-            }
+        return self.chrome.run_js(DROP_HINT_JS)
+
+    def studio_status(self) -> Dict:
+        """Tracks, drop-zone hint and import availability in one round-trip"""
+        results = self.chrome.run_js_batch({
+            "tracks": self._tracks_js(),
+            "drop": DROP_HINT_JS,
+            "import": IMPORT_PROBE_JS
+        })
+        return {
+            "tracks": self._parse_tracks(results["tracks"]),
+            "drop_hint": results["drop"],
+            "can_import": results["import"] == "found"
+        }
 
-            var text = document.body.innerText;
-            if (text.includes("Drop Here") || text.includes("drag")) {
-                return "Drag and drop supported";
-            }
+    def prepare_stems(
+        self,
+        stem_files: List[Union[str, Tuple[str, Optional[Dict]]]],
+        max_workers: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> List[Dict]:
+        """Prepare stems for import - analyze and convert if needed"""
+        return asyncio.run(self.prepare_stems_async(stem_files, max_workers, concurrency))
+
+    async def prepare_stems_async(
+        self,
+        stem_files: List[Union[str, Tuple[str, Optional[Dict]]]],
+        max_workers: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> List[Dict]:
+        """Analyze stems on a thread pool, then run up to `concurrency` ffmpegs at once
+
+        Entries may be paths or `scan_stem_folder`'s (path, sniffed info)
+        pairs; sniffed files aren't analyzed again.
+        """
+        loop = asyncio.get_running_loop()
+
+        existing = []
+        sniffed = {}
+        for entry in stem_files:
+            file_path, info = entry if isinstance(entry, tuple) else (entry, None)
+            if os.path.exists(file_path):
+                existing.append(file_path)
+                if info is not None:
+                    sniffed[file_path] = info
+            else:
+                print(f"  Skipping (not found): {file_path}")
 
-            return "Manual import may be required";
-        })()
-        '''
-        return self.chrome.run_js(js)
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            async def analyze(file_path: str) -> Dict:
+                if file_path in sniffed:
+                    return dict(sniffed[file_path])  # prepare annotates it; keep the scan's copy clean
+                return await loop.run_in_executor(pool, self.analyzer.analyze_file, file_path)
 
-    def prepare_stems(self, stem_files: List[str]) -> List[Dict]:
-        """Prepare stems for import - analyze and convert if needed"""
-        prepared = []
+            infos = await asyncio.gather(*(analyze(f) for f in existing))
 
-        for file_path in stem_files:
-            if not os.path.exists(file_path):
-                print(f"  Skipping (not found): {file_path}")
-                continue
+        prepared = []
+        conversions = []
 
-            info = self.analyzer.analyze_file(file_path)
+        for file_path, info in zip(existing, infos):
             if 'error' in info:
                 print(f"  Skipping (error): {file_path}")
                 continue
 
             info['stem_type'] = self.analyzer.detect_stem_type(info['filename'])
 
-            # Check if conversion needed
-            needs_conversion = (
-                info['sample_rate'] != 48000 or
-                info['channels'] != 2 or
-                not file_path.lower().endswith('.wav')
-            )
-
-            if needs_conversion:
-                output_name = Path(file_path).stem + "_suno.wav"
-                output_path = str(STEMS_DIR / output_name)
-
-                print(f"  Converting: {info['filename']} -> {output_name}")
-                if self.analyzer.convert_to_suno_format(file_path, output_path):
-                    info['converted_path'] = output_path
-                    info['needs_conversion'] = True
+            if not self.analyzer.is_suno_compliant(info, file_path):
+                output_name = os.path.splitext(info['filename'])[0] + "_suno.wav"
+                conversions.append((info, os.path.join(STEMS_DIR_STR, output_name)))
             else:
                 info['needs_conversion'] = False
 
             prepared.append(info)
 
+        # Bounded: past a few parallel encodes the disk, not the CPU, is the limit
+        semaphore = asyncio.Semaphore(concurrency or DEFAULT_CONVERT_CONCURRENCY)
+
+        async def convert(info: Dict, output_path: str) -> bool:
+            async with semaphore:
+                # Right rate/layout in another container: remux, don't re-encode
+                action = "Remuxing" if self.analyzer.can_remux(info) else "Converting"
+                print(f"  {action}: {info['filename']} -> {os.path.basename(output_path)}")
+                return await self.analyzer.convert_async(info['path'], output_path, info)
+
+        results = await asyncio.gather(*(convert(info, out) for info, out in conversions))
+        for (info, output_path), ok in zip(conversions, results):
+            if ok:
+                info['converted_path'] = output_path
+                info['needs_conversion'] = True
+
         return prepared
 
     def show_import_workflow(self, stems: List[Dict]):
         """Show step-by-step import workflow"""
-        print("\n" + "="*60)
-        print("STEM IMPORT WORKFLOW")
-        print("="*60)
-
-        print(f"\nPrepared {len(stems)} stems for import:\n")
-
-        for i, stem in enumerate(stems, 1):
-            path = stem.get('converted_path', stem['path'])
-            print(f"  {i}. {stem['filename']}")
-            print(f"     Type: {stem['stem_type']}")
-            print(f"     Duration: {stem['duration']:.1f}s")
-            if stem.get('needs_conversion'):
-                print(f"     Converted to: {stem['converted_path']}")
-
-        print("\n" + "-"*60)
-        print("IMPORT STEPS:")
-        print("-"*60)
-        print("""
+        # Build the whole report and write it once instead of print() per line
+        summary = "\n".join(
+            f"  {i}. {stem['filename']}\n"
+            f"     Type: {stem['stem_type']}\n"
+            f"     Duration: {stem['duration']:.1f}s"
+            + (f"\n     Converted to: {stem['converted_path']}" if stem.get('needs_conversion') else "")
+            for i, stem in enumerate(stems, 1)
+        )
+        tracks = "\n".join(
+            f"   Track {i}: {stem.get('converted_path', stem['path'])}"
+            for i, stem in enumerate(stems, 1)
+        )
+
+        sys.stdout.write(f"""
+{"="*60}
+STEM IMPORT WORKFLOW
+{"="*60}
+
+Prepared {len(stems)} stems for import:
+
+{summary}
+
+{"-"*60}
+IMPORT STEPS:
+{"-"*60}
+
 1. In SUNO Studio, select the target track (or add new track)
 2. Click "Open Library" or the import button
 3. Drag your audio file to the track, or use the file picker:
-""")
 
-        for i, stem in enumerate(stems, 1):
-            path = stem.get('converted_path', stem['path'])
-            print(f"   Track {i}: {path}")
+{tracks}
 
-        print("""
 4. Adjust clip position on timeline as needed
 5. Set track volume and effects
 
@@ -364,28 +867,47 @@ KEYBOARD SHORTCUTS (in SUNO Studio):
   Cmd+Z       - Undo
   Cmd+S       - Save project
   +/-         - Zoom in/out
+
 """)
+        sys.stdout.flush()
 
 
-def scan_stem_folder(folder: str) -> List[str]:
-    """Scan folder for audio files"""
-    audio_extensions = {'.wav', '.mp3', '.aiff', '.flac', '.m4a', '.ogg'}
-    stems = []
+def scan_stem_folder(folder: str) -> List[Tuple[str, Optional[Dict]]]:
+    """Scan folder for audio files, sniffing WAV headers along the way
 
-    folder_path = Path(folder)
-    if not folder_path.exists():
+    Returns sorted (path, info) pairs; info is None unless the file is
+    a WAV whose header could be read directly.
+    """
+    if not os.path.isdir(folder):
         return []
 
-    for f in folder_path.iterdir():
-        if f.suffix.lower() in audio_extensions:
-            stems.append(str(f))
+    with os.scandir(folder) as entries:
+        stems = sorted(
+            e.path for e in entries
+            if os.path.splitext(e.name)[1].lower() in AUDIO_EXTENSIONS and e.is_file()
+        )
 
-    return sorted(stems)
+    if not stems:
+        return []
+
+    # Tiny reads, so overlap the per-file open/read latency
+    with ThreadPoolExecutor(max_workers=min(16, len(stems))) as pool:
+        infos = list(pool.map(StemAnalyzer.sniff_file, stems))
+
+    return list(zip(stems, infos))
 
 
-def interactive_mode():
+def interactive_mode(max_workers: Optional[int] = None, concurrency: Optional[int] = None,
+                     cdp_port: Optional[int] = None):
     """Interactive stem import mode"""
-    importer = SunoStudioImporter()
+    cdp = None
+    if cdp_port:
+        cdp = CDPClient(cdp_port)
+        if not cdp.connect():
+            print(f"DevTools not reachable on port {cdp_port} - using AppleScript")
+            cdp = None
+    chrome = ChromeController(cdp)
+    importer = SunoStudioImporter(chrome)
 
     print("""
 ╔══════════════════════════════════════════════════════════════╗
@@ -431,11 +953,14 @@ def interactive_mode():
                 print("Navigated to SUNO Studio")
 
             elif action == 'tracks':
-                tracks = importer.get_current_tracks()
+                status = importer.studio_status()
+                tracks = status['tracks']
                 if tracks:
                     print(f"\nFound {len(tracks)} tracks:")
                     for t in tracks:
                         print(f"  Track {t['num']}: {t['name']}")
+                    print(f"  {status['drop_hint']}")
+                    print(f"  Import button: {'available' if status['can_import'] else 'not found'}")
                 else:
                     print("No tracks found - navigate to Studio first")
 
@@ -470,7 +995,7 @@ def interactive_mode():
                     scanned_stems = scan_stem_folder(folder)
                     if scanned_stems:
                         print(f"\nFound {len(scanned_stems)} audio files:")
-                        for f in scanned_stems:
+                        for f, _ in scanned_stems:
                             print(f"  {os.path.basename(f)}")
                     else:
                         print("No audio files found in that folder")
@@ -479,7 +1004,7 @@ def interactive_mode():
                     scanned_stems = scan_stem_folder(str(STEMS_DIR))
                     if scanned_stems:
                         print(f"\nFound {len(scanned_stems)} audio files in stems folder:")
-                        for f in scanned_stems:
+                        for f, _ in scanned_stems:
                             print(f"  {os.path.basename(f)}")
                     else:
                         print(f"No stems in {STEMS_DIR}")
@@ -488,7 +1013,7 @@ def interactive_mode():
             elif action == 'prepare':
                 if scanned_stems:
                     print("\nPreparing stems...")
-                    prepared_stems = importer.prepare_stems(scanned_stems)
+                    prepared_stems = importer.prepare_stems(scanned_stems, max_workers, concurrency)
                     print(f"\nPrepared {len(prepared_stems)} stems for import")
                 else:
                     print("No stems scanned. Use 'scan <folder>' first")
@@ -515,8 +1040,22 @@ def interactive_mode():
         except Exception as e:
             print(f"Error: {e}")
 
+    chrome.close()
     print("\nGoodbye!")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="VLTRN SUNO Stem Importer")
+    parser.add_argument("--max-workers", type=int, default=None,
+                        help="Threads for stem analysis (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help=f"Parallel ffmpeg conversions (default: {DEFAULT_CONVERT_CONCURRENCY})")
+    parser.add_argument("--cdp", type=int, nargs="?", const=9222, default=None, metavar="PORT",
+                        help="Run page JS over Chrome DevTools (default port: 9222)")
+    args = parser.parse_args()
+
+    interactive_mode(max_workers=args.max_workers, concurrency=args.concurrency, cdp_port=args.cdp)
+
+
 if __name__ == "__main__":
-    interactive_mode()
+    main()
@@ -7,6 +7,7 @@ import os
 import sys
 import json
 import time
+import asyncio
 import logging
 import argparse
 from pathlib import Path
@@ -15,10 +16,8 @@ from typing import Optional, List, Dict, Any
 # Add agents to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from agents.session_manager import SessionManager
-from agents.prompt_engineer import PromptEngineer, GenreTemplates
-from agents.generation_queue import GenerationQueue
-from agents.download_manager import DownloadManager
+# Agent modules pull in Selenium, requests, etc. - they're imported where
+# first needed so `--help` and other no-op runs start fast
 
 logging.basicConfig(
     level=logging.INFO,
@@ -44,11 +43,20 @@ class VLTRNSunoController:
             d.mkdir(exist_ok=True)
 
         # Initialize agents
+        from agents.session_manager import SessionManager
+        from agents.prompt_engineer import PromptEngineer
+        from agents.generation_queue import GenerationQueue
+        from agents.download_manager import DownloadManager
+
         self.session = SessionManager()
         self.prompt_engineer = PromptEngineer()
         self.queue = GenerationQueue()
         self.downloader = DownloadManager(str(self.downloads_dir))
 
+        # Raw DevTools connection (a CDPClient) on the session's debug port,
+        # opened on first chrome_cdp_send
+        self.cdp = None
+
         self.is_connected = False
 
     def connect(self, debug_port: int = 9222) -> bool:
@@ -181,8 +189,21 @@ class VLTRNSunoController:
         """Download a single song"""
         return self.downloader.download_song(suno_id, title, genre)
 
-    def download_completed(self) -> List[Any]:
+    async def download_completed_async(self, concurrency: int = 8) -> List[Any]:
+        """Download all completed songs from the queue concurrently"""
+        jobs = [
+            {"suno_id": job.suno_id, "title": job.title}
+            for job in self.queue.completed if job.suno_id
+        ]
+        return await self.downloader.download_many_async(jobs, concurrency)
+
+    def download_completed(self, concurrency: int = 8) -> List[Any]:
         """Download all completed songs from the queue"""
+        from agents.download_manager import HTTPX_AVAILABLE
+
+        if HTTPX_AVAILABLE:
+            return asyncio.run(self.download_completed_async(concurrency))
+
         songs = []
         for job in self.queue.completed:
             if job.suno_id:
@@ -194,6 +215,21 @@ class VLTRNSunoController:
                     songs.append(song)
         return songs
 
+    def chrome_cdp_send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Send a DevTools command to the SUNO tab over one shared connection"""
+        if self.cdp is None or not self.cdp.is_connected:
+            from cdp_client import CDPClient
+            self.cdp = CDPClient(self.session.debug_port)
+            if not self.cdp.connect():
+                logger.error("Could not open DevTools connection")
+                return None
+
+        try:
+            return self.cdp.send(method, params)
+        except Exception as e:
+            logger.error(f"CDP {method} failed: {e}")
+            return None
+
     def status(self) -> Dict[str, Any]:
         """Get current status"""
         return {
@@ -204,6 +240,8 @@ class VLTRNSunoController:
 
     def interactive_mode(self):
         """Run in interactive mode"""
+        from agents.prompt_engineer import GenreTemplates
+
         print("\n" + "=" * 60)
         print("VLTRN SUNO Controller - Interactive Mode")
         print("=" * 60)
@@ -273,6 +311,8 @@ class VLTRNSunoController:
 
     def close(self):
         """Clean up and close connections"""
+        if self.cdp is not None:
+            self.cdp.close()
         self.session.close()
         logger.info("Controller closed")
 
@@ -289,6 +329,11 @@ def main():
 
     args = parser.parse_args()
 
+    if not any([args.connect, args.generate, args.interactive]):
+        # Show help
+        parser.print_help()
+        return
+
     controller = VLTRNSunoController()
 
     try:
@@ -311,10 +356,6 @@ def main():
         if args.interactive:
             controller.interactive_mode()
 
-        if not any([args.connect, args.generate, args.interactive]):
-            # Show help
-            parser.print_help()
-
     finally:
         controller.close()
 
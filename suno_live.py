@@ -4,6 +4,7 @@ VLTRN SUNO Live Controller
 Direct interaction with Chrome via AppleScript (no debugging port needed)
 """
 import subprocess
+import atexit
 import time
 import json
 import re
@@ -11,13 +12,42 @@ import os
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+from osa_repl import OsaRepl, applescript_string
+
 BASE_DIR = Path(__file__).parent
 
+# Backslash, quote and line breaks escaped in one pass for AppleScript string literals
+_APPLESCRIPT_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+_osa = OsaRepl()
+atexit.register(_osa.close)
+
 
 def run_applescript(script: str) -> str:
     """Run an AppleScript and return the result"""
+    result = _osa.run(script)
+    if result is not None:
+        return result
+
+    # Script on stdin rather than argv: no ARG_MAX limit or argv copy for big JS payloads
     result = subprocess.run(
-        ["osascript", "-e", script],
+        ["osascript", "-"],
+        input=script,
+        capture_output=True,
+        text=True
+    )
+    return result.stdout.strip()
+
+
+def run_jxa(script: str) -> str:
+    """Run a JavaScript for Automation script and return the result"""
+    result = _osa.run(script, "JavaScript")
+    if result is not None:
+        return result
+
+    result = subprocess.run(
+        ["osascript", "-l", "JavaScript", "-"],
+        input=script,
         capture_output=True,
         text=True
     )
@@ -27,7 +57,7 @@ def run_applescript(script: str) -> str:
 def run_js_in_chrome(js_code: str) -> str:
     """Execute JavaScript in Chrome's active tab"""
     # Escape the JavaScript for AppleScript
-    escaped_js = js_code.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    escaped_js = js_code.translate(_APPLESCRIPT_ESCAPE)
 
     script = f'''
     tell application "Google Chrome"
@@ -41,88 +71,191 @@ def run_js_in_chrome(js_code: str) -> str:
 
 def get_chrome_url() -> str:
     """Get the current URL in Chrome"""
-    script = '''
-    tell application "Google Chrome"
-        get URL of active tab of front window
-    end tell
-    '''
-    return run_applescript(script)
+    return run_jxa('Application("Google Chrome").windows[0].activeTab.url()')
 
 
 def get_chrome_title() -> str:
     """Get the current page title in Chrome"""
-    script = '''
-    tell application "Google Chrome"
-        get title of active tab of front window
-    end tell
-    '''
-    return run_applescript(script)
+    return run_jxa('Application("Google Chrome").windows[0].activeTab.title()')
 
 
 def navigate_to(url: str):
     """Navigate Chrome to a URL"""
-    script = f'''
-    tell application "Google Chrome"
-        set URL of active tab of front window to "{url}"
+    run_jxa(f'Application("Google Chrome").windows[0].activeTab.url = {json.dumps(url)}')
+
+
+PAGE_STATE_SCRIPT = '''
+tell application "Google Chrome"
+    tell active tab of front window
+        if loading then return "loading"
+        execute javascript {}
     end tell
-    '''
-    run_applescript(script)
+end tell
+'''
+
+
+def wait_for_page_load(url: str, timeout: float = 10.0) -> bool:
+    """Poll until the active tab is on url and has finished loading, up to timeout seconds"""
+    # The page being left is also "complete" until navigation starts, so the URL comes first
+    js = f'location.href.startsWith({json.dumps(url)}) ? document.readyState : "navigating"'
+    script = PAGE_STATE_SCRIPT.format(applescript_string(js))
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(0.2)
+        # Tab loading flag, URL and readyState in one round-trip on the shared REPL
+        if run_applescript(script) == "complete":
+            return True
+    return False
+
+
+# Every tab URL of every window comes back from one bulk property read
+FIND_SUNO_TAB_JXA = """
+(function() {
+    var chrome = Application("Google Chrome");
+    var urls = chrome.windows.tabs.url();
+    for (var w = 0; w < urls.length; w++) {
+        for (var t = 0; t < urls[w].length; t++) {
+            if (urls[w][t] && urls[w][t].indexOf("suno.com") >= 0) {
+                var win = chrome.windows[w];
+                win.activeTabIndex = t + 1;
+                win.index = 1;
+                return "found";
+            }
+        }
+    }
+    return "not found";
+})()
+"""
 
 
 def find_suno_tab() -> bool:
     """Find and switch to the SUNO tab"""
-    script = '''
-    tell application "Google Chrome"
-        set windowList to every window
-        repeat with w in windowList
-            set tabList to every tab of w
-            repeat with t in tabList
-                if URL of t contains "suno.com" then
-                    set active tab index of w to (index of t)
-                    set index of w to 1
-                    return "found"
-                end if
-            end repeat
-        end repeat
-        return "not found"
-    end tell
-    '''
-    result = run_applescript(script)
-    return "found" in result
+    return run_jxa(FIND_SUNO_TAB_JXA) == "found"
 
 
-def check_suno_login() -> Dict[str, Any]:
-    """Check SUNO login status and credits"""
-    js = '''
-    (function() {
-        var result = {logged_in: false, credits: null, user: null};
+# Page-side JS as function expressions returning plain values, so the same
+# code serves the single-purpose calls and the fused probes below
+LOGIN_STATUS_FN = """
+function() {
+    var result = {logged_in: false, credits: null, user: null};
+    var userSel = '[class*="avatar"], [class*="user"], [data-testid="user"]';
+    var creditSel = '[class*="credit"], [class*="Credit"]';
 
-        // Check for user menu or avatar
-        var userElements = document.querySelectorAll('[class*="avatar"], [class*="user"], [data-testid="user"]');
-        if (userElements.length > 0) {
+    // User menu/avatar and credits display, from one DOM walk
+    for (var el of document.querySelectorAll(userSel + ', ' + creditSel)) {
+        if (!result.logged_in && el.matches(userSel)) {
             result.logged_in = true;
         }
+        if (result.credits === null && el.matches(creditSel)) {
+            var match = el.textContent.match(/(\\d+)\\s*credit/i);
+            if (match) result.credits = parseInt(match[1]);
+        }
+        if (result.logged_in && result.credits !== null) break;
+    }
 
-        // Try to find credits display
-        var creditElements = document.querySelectorAll('[class*="credit"], [class*="Credit"]');
-        for (var el of creditElements) {
-            var text = el.textContent;
-            var match = text.match(/(\d+)\s*credit/i);
-            if (match) {
-                result.credits = parseInt(match[1]);
-                break;
-            }
+    // Check URL
+    if (window.location.href.includes('/studio') || window.location.href.includes('/create')) {
+        result.logged_in = true;
+    }
+
+    return result;
+}
+"""
+
+SONG_LIST_FN = """
+function() {
+    // Every song card links to its song page, so the links alone cover them
+    var songs = [];
+    var seen = {};
+
+    for (var el of document.querySelectorAll('a[href*="/song/"]')) {
+        var match = el.href.match(/\\/song\\/([a-f0-9-]+)/);
+        if (match && !seen[match[1]]) {
+            seen[match[1]] = true;
+            songs.push({id: match[1], title: el.textContent.trim().substring(0, 50), url: el.href});
+            if (songs.length === 20) break;  // Stop at the cap rather than scan the whole library
         }
+    }
 
-        // Check URL
-        if (window.location.href.includes('/studio') || window.location.href.includes('/create')) {
-            result.logged_in = true;
+    return songs;
+}
+"""
+
+# Arm a one-shot generation watch. Song links already in the page (or knownIds,
+# when re-arming after a reload) are recorded so only a new one, or landing on
+# a song page, counts; a MutationObserver
+# stores the result in window.__vltrnGen, where cheap polls pick it up
+# (AppleScript can't await a promise, so the page does the waiting).
+GENERATION_WATCH_FN = """
+function(knownIds) {
+    var old = window.__vltrnGen;
+    if (old && old.observer) old.observer.disconnect();
+
+    var songRe = /\\/song\\/([a-f0-9-]+)/;
+    var known = {};
+    if (knownIds) {
+        knownIds.forEach(function(id) { known[id] = true; });
+    } else {
+        for (var el of document.querySelectorAll('a[href*="/song/"]')) {
+            var match = el.href.match(songRe);
+            if (match) known[match[1]] = true;
+        }
+    }
+    var state = {song_id: '', observer: null, pending: false, known: known};
+
+    function check() {
+        var page = location.pathname.match(songRe);
+        if (page) { state.song_id = page[1]; return true; }
+        for (var el of document.querySelectorAll('a[href*="/song/"]')) {
+            var match = el.href.match(songRe);
+            if (match && !known[match[1]]) { state.song_id = match[1]; return true; }
         }
+        return false;
+    }
+
+    window.__vltrnGen = state;
+    if (!check()) {
+        // Coalesce mutation bursts into one scan (setTimeout, not rAF: rAF stops in background tabs)
+        state.observer = new MutationObserver(function() {
+            if (state.pending) return;
+            state.pending = true;
+            setTimeout(function() {
+                state.pending = false;
+                if (check()) state.observer.disconnect();
+            }, 100);
+        });
+        state.observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['href']});
+    }
+    return {url: location.href, song_id: state.song_id, armed: true};
+}
+"""
 
-        return JSON.stringify(result);
-    })()
-    '''
-    result = run_js_in_chrome(js)
+# Read the watch result; armed is false if the page reloaded and lost it
+GENERATION_STATE_FN = """
+function() {
+    var state = window.__vltrnGen;
+    if (!state) return {url: location.href, song_id: '', armed: false};
+    if (!state.song_id) {
+        var page = location.pathname.match(/\\/song\\/([a-f0-9-]+)/);
+        if (page) state.song_id = page[1];
+    }
+    return {url: location.href, song_id: state.song_id, armed: true};
+}
+"""
+
+# Startup probe: URL, login status and recent songs in one round-trip
+STARTUP_PROBE_JS = f"""
+JSON.stringify({{
+    url: location.href,
+    status: ({LOGIN_STATUS_FN})(),
+    songs: ({SONG_LIST_FN})()
+}})
+"""
+
+
+def check_suno_login() -> Dict[str, Any]:
+    """Check SUNO login status and credits"""
+    result = run_js_in_chrome(f"JSON.stringify(({LOGIN_STATUS_FN})())")
     try:
         return json.loads(result)
     except:
@@ -131,188 +264,269 @@ def check_suno_login() -> Dict[str, Any]:
 
 def get_song_list() -> List[Dict[str, str]]:
     """Get list of songs from the current SUNO page"""
-    js = '''
-    (function() {
-        var songs = [];
-        var songElements = document.querySelectorAll('[class*="song"], [data-testid*="song"], a[href*="/song/"]');
-
-        for (var el of songElements) {
-            var link = el.href || el.querySelector('a')?.href || '';
-            var match = link.match(/\\/song\\/([a-f0-9-]+)/);
-            if (match) {
-                var title = el.textContent.trim().substring(0, 50);
-                songs.push({id: match[1], title: title, url: link});
-            }
+    result = run_js_in_chrome(f"JSON.stringify(({SONG_LIST_FN})())")
+    try:
+        return json.loads(result)
+    except:
+        return []
+
+
+def get_startup_snapshot() -> Dict[str, Any]:
+    """URL, login status and song list from a single JS call"""
+    result = run_js_in_chrome(STARTUP_PROBE_JS)
+    try:
+        return json.loads(result)
+    except:
+        return {
+            "url": "",
+            "status": {"logged_in": False, "credits": None, "error": result},
+            "songs": []
         }
 
-        // Remove duplicates
-        var seen = {};
-        songs = songs.filter(function(s) {
-            if (seen[s.id]) return false;
-            seen[s.id] = true;
-            return true;
-        });
 
-        return JSON.stringify(songs.slice(0, 20));
-    })()
-    '''
-    result = run_js_in_chrome(js)
+def watch_generation(known: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Start watching for a new song link; the ones in the page, or `known`, don't count"""
+    result = run_js_in_chrome(f"JSON.stringify(({GENERATION_WATCH_FN})({json.dumps(known)}))")
     try:
         return json.loads(result)
     except:
-        return []
+        return {"url": "", "song_id": "", "armed": False}
 
 
-def fill_create_form(lyrics: str, style: str, title: str = "", instrumental: bool = False) -> bool:
-    """Fill the SUNO create form"""
-    # Navigate to create page if needed
-    current_url = get_chrome_url()
-    if "/create" not in current_url:
-        navigate_to("https://suno.com/create")
-        time.sleep(3)
-
-    # Try to click Custom mode
-    js_custom = '''
-    (function() {
-        var customBtn = document.querySelector('[class*="custom"], button:contains("Custom")');
-        if (!customBtn) {
-            var buttons = document.querySelectorAll('button');
-            for (var btn of buttons) {
-                if (btn.textContent.includes('Custom')) {
-                    btn.click();
-                    return 'clicked custom';
-                }
+def poll_generation() -> Dict[str, Any]:
+    """Current URL plus whatever the generation watch has found"""
+    result = run_js_in_chrome(f"JSON.stringify(({GENERATION_STATE_FN})())")
+    try:
+        return json.loads(result)
+    except:
+        return {"url": "", "song_id": "", "armed": False}
+
+
+# Whole create-form fill in one call; each DOM list is queried once
+FILL_FORM_FN = """
+function(args) {
+    // Off the create page: report where we are instead of filling anything
+    if (!location.href.includes('/create')) return {url: location.href, on_create: false};
+
+    var buttons = document.querySelectorAll('button');
+    var inputs = document.querySelectorAll('input');
+    var textareas = document.querySelectorAll('textarea');
+    var status = {url: location.href, on_create: true, custom: 'skipped', lyrics: 'no textarea found', style: 'no style input found', title: 'skipped'};
+
+    function setValue(el, value) {
+        el.value = value;
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+    }
+
+    function byPlaceholder(els, words) {
+        for (var el of els) {
+            var placeholder = (el.placeholder || '').toLowerCase();
+            if (words.some(function(w) { return placeholder.includes(w); })) return el;
+        }
+        return null;
+    }
+
+    // Custom mode
+    if (args.click_custom) {
+        status.custom = 'no custom button';
+        for (var btn of buttons) {
+            if (btn.textContent.includes('Custom')) {
+                btn.click();
+                status.custom = 'clicked custom';
+                break;
             }
+        }
+    }
+
+    // Lyrics
+    var lyricsBox = byPlaceholder(textareas, ['lyric', 'write']);
+    if (lyricsBox) {
+        setValue(lyricsBox, args.lyrics);
+        status.lyrics = 'filled lyrics';
+    } else if (textareas.length > 0) {
+        setValue(textareas[0], args.lyrics);
+        status.lyrics = 'filled first textarea';
+    }
+
+    // Style
+    var styleInput = byPlaceholder(inputs, ['style', 'genre']);
+    if (styleInput) {
+        setValue(styleInput, args.style);
+        status.style = 'filled style';
+    }
+
+    // Title
+    if (args.title) {
+        var titleInput = byPlaceholder(inputs, ['title', 'name']);
+        if (titleInput) setValue(titleInput, args.title);
+        status.title = titleInput ? 'filled title' : 'no title input found';
+    }
+
+    return status;
+}
+"""
+
+
+CREATE_BUTTON_FN = """
+function() {
+    var buttons = document.querySelectorAll('button');
+    for (var btn of buttons) {
+        var text = btn.textContent.toLowerCase();
+        if (text.includes('create') || text.includes('generate') || text.includes('make')) {
+            if (!btn.disabled) {
+                btn.click();
+                return 'clicked: ' + btn.textContent;
+            }
+        }
+    }
+    return 'no create button found';
+}
+"""
+
+# Fill, click Create and arm the generation watch from one call. The steps keep
+# the old pacing on page timers (Custom fields render after the click; Create
+# needs a beat to take the input events) and record progress in __vltrnSubmit.
+SUBMIT_GENERATION_FN = """
+function(args, fillForm, watchGeneration, clickCreate) {
+    var form = fillForm(args);
+    if (form.on_create === false) return {url: form.url, on_create: false, stage: 'not started'};
+
+    var state = {stage: 'filling', form: form, button: ''};
+    window.__vltrnSubmit = state;
+
+    function submit() {
+        // Armed right before the click so existing song links don't count
+        watchGeneration();
+        state.button = clickCreate();
+        state.stage = state.button.indexOf('clicked') === 0 ? 'submitted' : 'failed';
+    }
+
+    setTimeout(function() {
+        if (form.custom === 'clicked custom') {
+            var refill = {lyrics: args.lyrics, style: args.style, title: args.title, click_custom: false};
+            state.form = fillForm(refill);
+            setTimeout(submit, 1000);
         } else {
-            customBtn.click();
-            return 'clicked custom';
+            submit();
         }
-        return 'no custom button';
-    })()
-    '''
-    run_js_in_chrome(js_custom)
-    time.sleep(1)
-
-    # Fill lyrics
-    escaped_lyrics = lyrics.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n')
-    js_lyrics = f'''
-    (function() {{
-        var textareas = document.querySelectorAll('textarea');
-        for (var ta of textareas) {{
-            var placeholder = ta.placeholder || '';
-            if (placeholder.toLowerCase().includes('lyric') || placeholder.toLowerCase().includes('write')) {{
-                ta.value = '{escaped_lyrics}';
-                ta.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                return 'filled lyrics';
-            }}
-        }}
-        if (textareas.length > 0) {{
-            textareas[0].value = '{escaped_lyrics}';
-            textareas[0].dispatchEvent(new Event('input', {{ bubbles: true }}));
-            return 'filled first textarea';
-        }}
-        return 'no textarea found';
-    }})()
-    '''
-    result = run_js_in_chrome(js_lyrics)
-    print(f"  Lyrics: {result}")
-
-    # Fill style
-    escaped_style = style.replace("'", "\\'")
-    js_style = f'''
-    (function() {{
-        var inputs = document.querySelectorAll('input');
-        for (var inp of inputs) {{
-            var placeholder = inp.placeholder || '';
-            if (placeholder.toLowerCase().includes('style') || placeholder.toLowerCase().includes('genre')) {{
-                inp.value = '{escaped_style}';
-                inp.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                return 'filled style';
-            }}
-        }}
-        return 'no style input found';
-    }})()
-    '''
-    result = run_js_in_chrome(js_style)
-    print(f"  Style: {result}")
+    }, 1000);
+
+    return {url: form.url, on_create: true, stage: state.stage};
+}
+"""
+
+# Submit progress; the song id only counts once this submit has clicked Create.
+# known is the pre-click song id snapshot, so a reload can re-arm against it.
+SUBMIT_STATE_FN = """
+function(generationState) {
+    var state = window.__vltrnSubmit || {stage: 'missing', form: {}, button: ''};
+    var generation = generationState();
+    var submitted = state.stage === 'submitted';
+    return {
+        stage: state.stage,
+        form: state.form,
+        button: state.button,
+        url: generation.url,
+        song_id: submitted ? generation.song_id : '',
+        known: submitted && window.__vltrnGen ? Object.keys(window.__vltrnGen.known) : null
+    };
+}
+"""
+
+def run_fill_form(lyrics: str, style: str, title: str = "", click_custom: bool = True) -> Dict[str, str]:
+    """Run FILL_FORM_FN with JSON-encoded arguments and return its status"""
+    args = json.dumps({"lyrics": lyrics, "style": style, "title": title, "click_custom": click_custom})
+    result = run_js_in_chrome(f"JSON.stringify(({FILL_FORM_FN})({args}))")
+    try:
+        return json.loads(result)
+    except:
+        return {"custom": result, "lyrics": result, "style": result, "title": result}
+
 
-    # Fill title if provided
+def fill_create_form(lyrics: str, style: str, title: str = "", instrumental: bool = False) -> bool:
+    """Fill the SUNO create form"""
+    # The fill reports the URL itself, so there is no separate URL round-trip
+    status = run_fill_form(lyrics, style, title)
+    if status.get("on_create") is False:
+        navigate_to("https://suno.com/create")
+        wait_for_page_load("https://suno.com/create")
+        status = run_fill_form(lyrics, style, title)
+        if status.get("on_create") is False:
+            print(f"  Not on the create page: {status.get('url')}")
+            return False
+
+    if status.get("custom") == "clicked custom":
+        # Custom mode renders its fields after the click - fill again once they're up
+        time.sleep(1)
+        status = run_fill_form(lyrics, style, title, click_custom=False)
+
+    print(f"  Lyrics: {status.get('lyrics')}")
+    print(f"  Style: {status.get('style')}")
     if title:
-        escaped_title = title.replace("'", "\\'")
-        js_title = f'''
-        (function() {{
-            var inputs = document.querySelectorAll('input');
-            for (var inp of inputs) {{
-                var placeholder = inp.placeholder || '';
-                if (placeholder.toLowerCase().includes('title') || placeholder.toLowerCase().includes('name')) {{
-                    inp.value = '{escaped_title}';
-                    inp.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                    return 'filled title';
-                }}
-            }}
-            return 'no title input found';
-        }})()
-        '''
-        result = run_js_in_chrome(js_title)
-        print(f"  Title: {result}")
+        print(f"  Title: {status.get('title')}")
 
     return True
 
 
 def click_create_button() -> bool:
     """Click the Create/Generate button"""
-    js = '''
-    (function() {
-        var buttons = document.querySelectorAll('button');
-        for (var btn of buttons) {
-            var text = btn.textContent.toLowerCase();
-            if (text.includes('create') || text.includes('generate') || text.includes('make')) {
-                if (!btn.disabled) {
-                    btn.click();
-                    return 'clicked: ' + btn.textContent;
-                }
-            }
-        }
-        return 'no create button found';
-    })()
-    '''
-    result = run_js_in_chrome(js)
+    result = run_js_in_chrome(f"({CREATE_BUTTON_FN})()")
     print(f"  Button: {result}")
     return "clicked" in result
 
 
-def wait_for_generation(timeout: int = 180) -> Optional[str]:
-    """Wait for song generation to complete"""
+def submit_generation(lyrics: str, style: str, title: str = "") -> Dict[str, Any]:
+    """Start the fused fill / click Create / watch sequence in the page"""
+    args = json.dumps({"lyrics": lyrics, "style": style, "title": title, "click_custom": True})
+    result = run_js_in_chrome(
+        f"JSON.stringify(({SUBMIT_GENERATION_FN})({args}, {FILL_FORM_FN}, {GENERATION_WATCH_FN}, {CREATE_BUTTON_FN}))"
+    )
+    try:
+        return json.loads(result)
+    except:
+        return {"url": "", "on_create": None, "stage": "failed", "error": result}
+
+
+def poll_submission() -> Dict[str, Any]:
+    """Progress of the in-page submit sequence plus the generation watch"""
+    result = run_js_in_chrome(f"JSON.stringify(({SUBMIT_STATE_FN})({GENERATION_STATE_FN}))")
+    try:
+        return json.loads(result)
+    except:
+        return {"stage": "missing", "form": {}, "button": "", "url": "", "song_id": "", "known": None}
+
+
+def wait_for_submission(timeout: float = 10.0, interval: float = 0.5) -> Dict[str, Any]:
+    """Poll until the page has clicked Create (or given up), up to timeout seconds"""
+    deadline = time.time() + timeout
+    state = poll_submission()
+    while state.get("stage") == "filling" and time.time() < deadline:
+        time.sleep(interval)
+        state = poll_submission()
+    return state
+
+
+def wait_for_generation(timeout: int = 180, interval: float = 1,
+                        known: Optional[List[str]] = None) -> Optional[str]:
+    """Wait for song generation; a reload re-arms the watch against the pre-submit `known` ids"""
     print("  Waiting for generation...", end="", flush=True)
     start = time.time()
+    last_dot = start
 
     while time.time() - start < timeout:
-        # Check if URL changed to a song page
-        url = get_chrome_url()
-        if "/song/" in url:
-            song_id = url.split("/song/")[-1].split("?")[0]
-            print(f" Done!")
-            return song_id
-
-        # Check for new song in the page
-        js = '''
-        (function() {
-            var links = document.querySelectorAll('a[href*="/song/"]');
-            if (links.length > 0) {
-                var href = links[0].href;
-                var match = href.match(/\\/song\\/([a-f0-9-]+)/);
-                if (match) return match[1];
-            }
-            return '';
-        })()
-        '''
-        song_id = run_js_in_chrome(js)
+        # The in-page observer does the scanning; each poll only reads its result
+        poll = poll_generation()
+        if not poll.get("armed"):
+            poll = watch_generation(known)
+        song_id = poll.get("song_id")
         if song_id:
             print(f" Done!")
             return song_id
 
-        print(".", end="", flush=True)
-        time.sleep(5)
+        if time.time() - last_dot >= 5:
+            print(".", end="", flush=True)
+            last_dot = time.time()
+        time.sleep(interval)
 
     print(" Timeout!")
     return None
@@ -324,20 +538,30 @@ def generate_song(title: str, lyrics: str, style: str) -> Optional[str]:
     print(f"Generating: {title}")
     print(f"{'='*50}")
 
-    # Fill the form
-    if not fill_create_form(lyrics, style, title):
-        print("Failed to fill form")
+    # Fill, click Create and arm the watch in one call; the page paces the steps
+    submitted = submit_generation(lyrics, style, title)
+    if submitted.get("on_create") is False:
+        navigate_to("https://suno.com/create")
+        wait_for_page_load("https://suno.com/create")
+        submitted = submit_generation(lyrics, style, title)
+    if not submitted.get("on_create"):
+        print(f"Failed to fill form: not on the create page ({submitted.get('url')})")
         return None
 
-    time.sleep(1)
+    state = wait_for_submission()
+    form = state.get("form") or {}
+    print(f"  Lyrics: {form.get('lyrics')}")
+    print(f"  Style: {form.get('style')}")
+    if title:
+        print(f"  Title: {form.get('title')}")
+    print(f"  Button: {state.get('button')}")
 
-    # Click create
-    if not click_create_button():
+    if state.get("stage") != "submitted":
         print("Failed to click create button")
         return None
 
     # Wait for generation
-    song_id = wait_for_generation()
+    song_id = wait_for_generation(known=state.get("known"))
 
     if song_id:
         print(f"\nSong created: https://suno.com/song/{song_id}")
@@ -359,22 +583,22 @@ def main():
     else:
         print("    SUNO not open - navigating...")
         navigate_to("https://suno.com/create")
-        time.sleep(3)
+        wait_for_page_load("https://suno.com/create")
 
-    # Check current URL
-    url = get_chrome_url()
-    print(f"    URL: {url}")
+    # URL, login status and songs come back from one probe
+    snapshot = get_startup_snapshot()
+    print(f"    URL: {snapshot.get('url', '')}")
 
     # Check login status
     print("\n[2] Checking login status...")
-    status = check_suno_login()
+    status = snapshot.get("status", {})
     print(f"    Logged in: {status.get('logged_in', False)}")
     if status.get('credits'):
         print(f"    Credits: {status['credits']}")
 
     # Get song list if on library page
     print("\n[3] Getting recent songs...")
-    songs = get_song_list()
+    songs = snapshot.get("songs", [])
     if songs:
         print(f"    Found {len(songs)} songs:")
         for s in songs[:5]:
@@ -387,6 +611,10 @@ def main():
     print("Commands: generate, status, songs, quit")
     print("=" * 60)
 
+    # One line-buffered handle for the session: each song is a single write
+    log_fp = open(BASE_DIR / "generated_songs.jsonl", 'a', buffering=1)
+    atexit.register(log_fp.close)
+
     while True:
         try:
             cmd = input("\n> ").strip().lower()
@@ -439,24 +667,14 @@ A love that's truly divine
 
                 song_id = generate_song(title, lyrics, style)
                 if song_id:
-                    # Save to log
-                    log_file = BASE_DIR / "generated_songs.json"
-                    try:
-                        with open(log_file, 'r') as f:
-                            log = json.load(f)
-                    except:
-                        log = []
-
-                    log.append({
+                    # Append one JSON line; earlier entries are never re-read or rewritten
+                    log_fp.write(json.dumps({
                         "id": song_id,
                         "title": title,
                         "theme": theme,
                         "genre": genre,
                         "timestamp": time.time()
-                    })
-
-                    with open(log_file, 'w') as f:
-                        json.dump(log, f, indent=2)
+                    }) + "\n")
 
             else:
                 print("Commands: generate, status, songs, quit")
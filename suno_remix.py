@@ -7,7 +7,10 @@ import os
 import sys
 import time
 import json
+import re
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
+from typing import Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -16,8 +19,123 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from cdp_client import CDPClient
+
 BASE_DIR = Path(__file__).parent
 
+_SONG_ID_RE = re.compile(r'/song/([a-f0-9-]+)')
+
+# Direct DevTools connection to the driver's current tab, for hot read paths
+_cdp: Optional[CDPClient] = None
+
+SONG_LINKS_JS = """
+Array.from(document.querySelectorAll('a[href*="/song/"]'), a => ({
+    href: a.href,
+    text: (a.innerText || '').trim().substring(0, 50)
+}))
+"""
+
+# In-page scans: one execute_script instead of a WebDriver call per element.
+# isShown approximates Selenium's is_displayed (and .text being non-empty).
+FIND_REMIX_BUTTON_JS = """
+const targets = arguments[0].map(t => t.toLowerCase());
+const isShown = el => el.getClientRects().length > 0;
+const matches = text => targets.some(t => text.toLowerCase().includes(t));
+const hits = {};
+const menus = [];
+
+// One pass over buttons, links, aria-labelled icons and menu toggles;
+// buttons still outrank links, which outrank icons
+for (const el of document.querySelectorAll('button, a, [aria-label], [class*="menu"]')) {
+    const shown = isShown(el);
+    const kind = el.tagName === 'BUTTON' ? 'button' : el.tagName === 'A' ? 'link' : null;
+    if (kind && shown && !hits[kind]) {
+        const text = el.innerText.trim();
+        if (matches(text)) {
+            hits[kind] = {element: el, kind: kind, text: text};
+            if (kind === 'button') break;
+        }
+    }
+
+    const label = el.getAttribute('aria-label') || '';
+    if (label && !hits.icon && matches(label)) hits.icon = {element: el, kind: 'icon', text: label};
+
+    // Three-dot / more-options toggles, for when there is no direct remix control
+    const cls = el.getAttribute('class') || '';
+    if (shown && (label.includes('more') || label.includes('menu') || cls.includes('menu'))) menus.push(el);
+}
+
+const hit = hits.button || hits.link || hits.icon || null;
+return {hit: hit, menus: hit ? [] : menus};
+"""
+
+# One text-node walk in place of an XPath contains(text(), ...) per keyword;
+# keywords rank like the old selector order, so Remix beats Cover beats Extend
+FIND_REMIX_OPTION_JS = """
+const keywords = ['remix', 'cover', 'extend'];
+const isShown = el => el.getClientRects().length > 0;
+const found = [];
+
+const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+    const text = node.nodeValue.toLowerCase();
+    const rank = keywords.findIndex(k => text.includes(k));
+    if (rank < 0 || found[rank]) continue;
+    const el = node.parentElement;
+    if (el && isShown(el)) {
+        found[rank] = el;
+        if (rank === 0) break;
+    }
+}
+
+let element = found.find(Boolean);
+if (!element) {
+    for (const el of document.querySelectorAll("button[class*='remix'], [data-testid*='remix']")) {
+        const text = el.innerText.toLowerCase();
+        if (isShown(el) && keywords.some(k => text.includes(k))) {
+            element = el;
+            break;
+        }
+    }
+}
+return element ? {element: element, text: element.innerText.trim()} : null;
+"""
+
+FIND_CREATE_BUTTON_JS = """
+const targets = arguments[0].map(t => t.toLowerCase());
+for (const btn of document.querySelectorAll('button')) {
+    if (btn.disabled || btn.getClientRects().length === 0) continue;
+    const text = btn.innerText.trim();
+    if (targets.some(t => text.toLowerCase().includes(t))) return {element: btn, text: text};
+}
+return null;
+"""
+
+# Without DevTools: resolve in-page when the tab reaches a song page other
+# than arguments[0], instead of polling current_url from Python
+WAIT_FOR_NEW_SONG_JS = """
+const [songId, timeoutMs, done] = arguments;
+let finished = false;
+const finish = url => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(backstop);
+    clearTimeout(timer);
+    done(url);
+};
+const check = () => {
+    const url = location.href;
+    if (url.includes('/song/') && !url.includes(songId)) finish(url);
+};
+// SPA route changes re-render the page; the interval covers a bare pushState
+const observer = new MutationObserver(check);
+observer.observe(document.body, {childList: true, subtree: true});
+const backstop = setInterval(check, 1000);
+const timer = setTimeout(() => finish(null), timeoutMs);
+check();
+"""
+
 
 def connect_to_chrome(debug_port=9222):
     """Connect to Chrome with remote debugging"""
@@ -36,6 +154,24 @@ def connect_to_chrome(debug_port=9222):
 
 def find_suno_tab(driver):
     """Find and switch to SUNO tab"""
+    # One Target.getTargets lists every tab's URL; only the winner is switched to
+    try:
+        targets = driver.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        suno = [
+            t["targetId"] for t in targets
+            if t.get("type") == "page" and "suno.com" in t.get("url", "")
+        ]
+        if not suno:
+            return False
+        handles = {h.replace("CDwindow-", ""): h for h in driver.window_handles}
+        for target_id in suno:
+            if target_id in handles:
+                driver.switch_to.window(handles[target_id])
+                print(f"✅ Found SUNO: {driver.current_url}")
+                return True
+    except Exception:
+        pass  # Fall back to visiting each tab
+
     for handle in driver.window_handles:
         driver.switch_to.window(handle)
         if "suno.com" in driver.current_url:
@@ -44,22 +180,52 @@ def find_suno_tab(driver):
     return False
 
 
+def get_cdp(driver) -> Optional[CDPClient]:
+    """CDP client attached to the tab the driver is on (None if unavailable)"""
+    global _cdp
+    try:
+        host, port = driver.capabilities["goog:chromeOptions"]["debuggerAddress"].rsplit(":", 1)
+        # chromedriver window handles are DevTools target ids
+        target_id = driver.current_window_handle.replace("CDwindow-", "")
+    except Exception:
+        return None
+
+    if _cdp is not None:
+        if _cdp.is_connected and _cdp.target and _cdp.target.get("id") == target_id:
+            return _cdp
+        _cdp.close()
+
+    _cdp = CDPClient(int(port), host=host)
+    if not _cdp.connect(target_id):
+        _cdp = None
+    return _cdp
+
+
 def get_songs_on_page(driver):
     """Get list of songs visible on the page"""
+    links = None
+    cdp = get_cdp(driver)
+    if cdp:
+        try:
+            links = cdp.evaluate(SONG_LINKS_JS)
+        except Exception:
+            pass  # Fall back to WebDriver
+
     songs = []
     try:
-        # Find song elements
-        song_elements = driver.find_elements(By.CSS_SELECTOR, "a[href*='/song/']")
+        # Every link's href and text in one execute_script, not two RPCs per element
+        if links is None:
+            links = driver.execute_script("return " + SONG_LINKS_JS)
         seen = set()
 
-        for elem in song_elements:
-            href = elem.get_attribute("href") or ""
-            if "/song/" in href:
-                song_id = href.split("/song/")[-1].split("?")[0]
+        for link in links or []:
+            href = link["href"]
+            match = _SONG_ID_RE.search(href)
+            if match:
+                song_id = match.group(1)
                 if song_id not in seen and len(song_id) > 10:
                     seen.add(song_id)
-                    title = elem.text.strip()[:50] or "Untitled"
-                    songs.append({"id": song_id, "title": title, "url": href})
+                    songs.append({"id": song_id, "title": link["text"] or "Untitled", "url": href})
     except Exception as e:
         print(f"Error getting songs: {e}")
 
@@ -73,17 +239,17 @@ def click_song_menu(driver, song_element):
         from selenium.webdriver.common.action_chains import ActionChains
         actions = ActionChains(driver)
         actions.move_to_element(song_element).perform()
-        time.sleep(0.5)
 
-        # Look for menu button (three dots)
-        menu_buttons = driver.find_elements(By.CSS_SELECTOR,
-            "[class*='menu'], [class*='more'], [aria-label*='menu'], button[class*='dots']")
-
-        for btn in menu_buttons:
-            if btn.is_displayed():
-                btn.click()
-                time.sleep(0.5)
-                return True
+        # Look for menu button (three dots), as soon as the hover reveals one
+        try:
+            menu_buttons = WebDriverWait(driver, 2, poll_frequency=0.1).until(
+                EC.visibility_of_any_elements_located((By.CSS_SELECTOR,
+                    "[class*='menu'], [class*='more'], [aria-label*='menu'], button[class*='dots']"))
+            )
+            menu_buttons[0].click()
+            return True
+        except TimeoutException:
+            pass
 
         # Try finding by icon/svg
         svg_buttons = song_element.find_elements(By.CSS_SELECTOR, "button, [role='button']")
@@ -91,7 +257,6 @@ def click_song_menu(driver, song_element):
             try:
                 if btn.is_displayed() and btn.size['width'] < 50:  # Small icon button
                     btn.click()
-                    time.sleep(0.5)
                     return True
             except:
                 pass
@@ -101,106 +266,90 @@ def click_song_menu(driver, song_element):
     return False
 
 
-def find_remix_option(driver):
+def find_remix_option(driver, timeout=2):
     """Find and click the Remix option in a menu"""
     try:
-        # Look for remix in menus, buttons, or dropdowns
-        remix_selectors = [
-            "//*[contains(text(), 'Remix')]",
-            "//*[contains(text(), 'remix')]",
-            "//*[contains(text(), 'Cover')]",
-            "//*[contains(text(), 'cover')]",
-            "//*[contains(text(), 'Extend')]",
-            "//*[contains(text(), 'extend')]",
-            "button[class*='remix']",
-            "[data-testid*='remix']"
-        ]
-
-        for selector in remix_selectors:
-            try:
-                if selector.startswith("//"):
-                    elements = driver.find_elements(By.XPATH, selector)
-                else:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-
-                for elem in elements:
-                    if elem.is_displayed():
-                        text = elem.text.lower()
-                        if 'remix' in text or 'cover' in text or 'extend' in text:
-                            print(f"  Found: {elem.text}")
-                            elem.click()
-                            return True
-            except:
-                continue
+        # Look for remix in menus, buttons, or dropdowns, rescanning while the menu opens
+        found = WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(FIND_REMIX_OPTION_JS)
+        )
+        if found:
+            print(f"  Found: {found['text']}")
+            found["element"].click()
+            return True
 
+    except TimeoutException:
+        pass
     except Exception as e:
         print(f"Error finding remix: {e}")
     return False
 
 
+def wait_for_page_ready(driver, timeout=10) -> bool:
+    """Wait until the document has finished loading, up to timeout seconds"""
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
 def navigate_to_song(driver, song_id):
     """Navigate to a specific song page"""
     url = f"https://suno.com/song/{song_id}"
     driver.get(url)
-    time.sleep(3)
+    wait_for_page_ready(driver)
     print(f"✅ Navigated to song: {song_id}")
     return True
 
 
 def find_remix_button_on_song_page(driver):
-    """Find remix/extend/cover buttons on a song page"""
+    """Find remix/extend/cover buttons on a song page, plus menu toggles to fall back on"""
     try:
-        time.sleep(2)
-
         # Common button texts for remix features
         button_texts = ['Remix', 'Cover', 'Extend', 'Create Cover', 'Make Cover', 'Reuse Prompt']
 
-        buttons = driver.find_elements(By.TAG_NAME, "button")
-
-        for btn in buttons:
-            try:
-                text = btn.text.strip()
-                for target in button_texts:
-                    if target.lower() in text.lower():
-                        print(f"  Found button: {text}")
-                        return btn
-            except:
-                continue
+        # Buttons, links, aria-labels and menu toggles - all in one round-trip,
+        # repeated until a remix control renders (at most the old 2s pause)
+        found = {"hit": None, "menus": []}
 
-        # Also check for links
-        links = driver.find_elements(By.TAG_NAME, "a")
-        for link in links:
-            try:
-                text = link.text.strip()
-                for target in button_texts:
-                    if target.lower() in text.lower():
-                        print(f"  Found link: {text}")
-                        return link
-            except:
-                continue
+        def scan(d):
+            found.update(d.execute_script(FIND_REMIX_BUTTON_JS, button_texts))
+            return found["hit"]
 
-        # Check for icon buttons with aria-labels
-        icon_buttons = driver.find_elements(By.CSS_SELECTOR, "[aria-label]")
-        for btn in icon_buttons:
-            label = btn.get_attribute("aria-label") or ""
-            for target in button_texts:
-                if target.lower() in label.lower():
-                    print(f"  Found icon: {label}")
-                    return btn
+        try:
+            WebDriverWait(driver, 2, poll_frequency=0.2).until(scan)
+        except TimeoutException:
+            pass
+        hit = found["hit"]
+        if hit:
+            print(f"  Found {hit['kind']}: {hit['text']}")
+            return hit['element'], []
+        return None, found["menus"]
 
     except Exception as e:
         print(f"Error finding remix button: {e}")
 
-    return None
+    return None, []
 
 
 def fill_remix_form(driver, new_style=None, keep_lyrics=True):
     """Fill in the remix form with new style"""
     try:
-        time.sleep(2)
-
         # Look for style input
         if new_style:
+            # Wait for the remix form to render instead of a fixed pause
+            try:
+                WebDriverWait(driver, 2, poll_frequency=0.1).until(
+                    EC.visibility_of_any_elements_located((By.CSS_SELECTOR,
+                        "input[placeholder*='style'], input[placeholder*='Style'], input[placeholder*='genre'], "
+                        "textarea[placeholder*='style']"))
+                )
+            except TimeoutException:
+                pass
+
             style_inputs = driver.find_elements(By.CSS_SELECTOR,
                 "input[placeholder*='style'], input[placeholder*='Style'], input[placeholder*='genre']")
 
@@ -230,19 +379,17 @@ def click_create_remix(driver):
     try:
         button_texts = ['Create', 'Generate', 'Remix', 'Make', 'Submit']
 
-        buttons = driver.find_elements(By.TAG_NAME, "button")
-
-        for btn in buttons:
-            try:
-                text = btn.text.strip()
-                if any(t.lower() in text.lower() for t in button_texts):
-                    if btn.is_enabled() and btn.is_displayed():
-                        btn.click()
-                        print(f"  Clicked: {text}")
-                        return True
-            except:
-                continue
+        # First enabled, visible match, found in-page once the form enables it
+        hit = WebDriverWait(driver, 2, poll_frequency=0.1).until(
+            lambda d: d.execute_script(FIND_CREATE_BUTTON_JS, button_texts)
+        )
+        if hit:
+            hit['element'].click()
+            print(f"  Clicked: {hit['text']}")
+            return True
 
+    except TimeoutException:
+        pass
     except Exception as e:
         print(f"Error clicking create: {e}")
 
@@ -261,25 +408,20 @@ def remix_song(driver, song_id, new_style):
 
     # Find remix button
     print("\n[1] Looking for remix option...")
-    remix_btn = find_remix_button_on_song_page(driver)
+    remix_btn, menu_btns = find_remix_button_on_song_page(driver)
 
     if remix_btn:
         remix_btn.click()
-        time.sleep(2)
         print("  Clicked remix button")
     else:
         print("  No remix button found - checking for menu...")
         # Try menu approach
-        # Look for three dots or more options
-        menu_btns = driver.find_elements(By.CSS_SELECTOR,
-            "[aria-label*='more'], [aria-label*='menu'], [class*='menu']")
+        # Three dots / more options came back visible from the same scan
         for btn in menu_btns:
             try:
-                if btn.is_displayed():
-                    btn.click()
-                    time.sleep(1)
-                    if find_remix_option(driver):
-                        break
+                btn.click()
+                if find_remix_option(driver, timeout=1):
+                    break
             except:
                 continue
 
@@ -289,23 +431,71 @@ def remix_song(driver, song_id, new_style):
 
     # Click create
     print("\n[3] Creating remix...")
-    time.sleep(1)
     click_create_remix(driver)
 
     # Wait for generation
     print("\n[4] Waiting for generation...")
+    new_id = wait_for_new_song(driver, song_id)
+    if new_id:
+        print(f"\n✅ Remix created: {new_id}")
+        print(f"   URL: https://suno.com/song/{new_id}")
+        return new_id
+
+    print("\n⚠️ Timeout - check SUNO manually")
+    return None
+
+
+def _new_song_id(url: str, song_id: str) -> Optional[str]:
+    match = _SONG_ID_RE.search(url)
+    if match and match.group(1) != song_id:
+        return match.group(1)
+    return None
+
+
+def wait_for_new_song(driver, song_id, timeout=180) -> Optional[str]:
+    """Wait for the tab to land on a song page other than song_id"""
+    cdp = get_cdp(driver)
+    if cdp:
+        try:
+            cdp.send("Page.enable")
+            # Full navigations and SPA (pushState) route changes
+            event = cdp.expect_event(
+                ("Page.frameNavigated", "Page.navigatedWithinDocument"),
+                lambda p: _new_song_id(p.get("url") or p.get("frame", {}).get("url", ""), song_id) is not None
+            )
+            # The remix may already have navigated before we subscribed
+            new_id = _new_song_id(cdp.evaluate("location.href") or "", song_id)
+            if new_id:
+                event.cancel()
+                return new_id
+            try:
+                params = event.result(timeout)["params"]
+            except FutureTimeoutError:
+                event.cancel()
+                return None
+            return _new_song_id(params.get("url") or params["frame"]["url"], song_id)
+        except Exception:
+            pass  # Fall back to the in-page wait
+
+    # A full navigation unloads the page mid-script; current_url then tells
     start = time.time()
-    while time.time() - start < 180:
-        current_url = driver.current_url
-        if "/song/" in current_url and song_id not in current_url:
-            new_id = current_url.split("/song/")[-1].split("?")[0]
-            print(f"\n✅ Remix created: {new_id}")
-            print(f"   URL: https://suno.com/song/{new_id}")
+    try:
+        driver.set_script_timeout(timeout + 5)
+        url = driver.execute_async_script(WAIT_FOR_NEW_SONG_JS, song_id, timeout * 1000)
+        return _new_song_id(url, song_id) if url else None
+    except Exception:
+        new_id = _new_song_id(driver.current_url, song_id)
+        if new_id:
+            return new_id
+    finally:
+        driver.set_script_timeout(30)
+
+    while time.time() - start < timeout:
+        new_id = _new_song_id(driver.current_url, song_id)
+        if new_id:
             return new_id
         print(".", end="", flush=True)
         time.sleep(5)
-
-    print("\n⚠️ Timeout - check SUNO manually")
     return None
 
 
@@ -340,7 +530,7 @@ def interactive_mode(driver):
 
             elif cmd == "refresh":
                 driver.refresh()
-                time.sleep(2)
+                wait_for_page_ready(driver)
                 print("Page refreshed")
 
             elif cmd == "goto":
@@ -406,7 +596,7 @@ def main():
     if not find_suno_tab(driver):
         print("  Navigating to SUNO...")
         driver.get("https://suno.com/studio")
-        time.sleep(3)
+        wait_for_page_ready(driver)
 
     print(f"  Current: {driver.current_url}")
 
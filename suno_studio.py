@@ -1,17 +1,163 @@
 #!/usr/bin/env python3
 """
 VLTRN SUNO Studio Mixer Controller
-Automates mixing and track manipulation in SUNO Studio via AppleScript
+Automates mixing and track manipulation in SUNO Studio via JavaScript for Automation
+
+Scripts sent to Chrome only address the active tab of the front window; any
+filtering (which tab, which element) happens in page JS. osascript evaluates
+`whose`/`where` filter clauses one Apple Event at a time, turning a
+millisecond call into seconds, so run_applescript and run_jxa refuse them.
 """
+import re
 import subprocess
+import hashlib
+import shutil
+import atexit
 import time
 import json
+import uuid
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
+from osa_repl import OsaRepl, applescript_string
+
+
+# Navigates to Studio unless already there, waits for it (readyJs answers
+# "ready"), then returns the url and the stateJs probe in one call
+ENSURE_STUDIO_JXA = '''
+function ensureStudio(url, readyJs, stateJs, timeout) {
+    var tab = Application("Google Chrome").windows[0].activeTab;
+    var navigated = tab.url().indexOf("studio") === -1;
+    if (navigated) {
+        tab.url = url;
+        var deadline = Date.now() + Number(timeout) * 1000;
+        while (Date.now() < deadline && (tab.loading() || tab.execute({javascript: readyJs}) !== "ready")) {
+            delay(0.2);
+        }
+    }
+    var state = tab.execute({javascript: stateJs});
+    return JSON.stringify({url: tab.url(), navigated: navigated, state: state ? JSON.parse(state) : null});
+}
+'''
+
+# Chrome handlers in JXA (JavaScript for Automation), compiled once with
+# osacompile; calls then name a handler instead of sending (and re-parsing)
+# a script every time. Tabs are reached by explicit index, never `whose`.
+STUDIO_LIBRARY_SOURCE = '''
+function run(argv) {
+    var handler = argv[0];
+    if (handler === "runJS") return runJS(argv[1]);
+    if (handler === "getURL") return getURL();
+    if (handler === "navigate") navigate(argv[1]);
+    if (handler === "ensureStudio") return ensureStudio(argv[1], argv[2], argv[3], argv[4]);
+    return "";
+}
+
+function activeTab() {
+    return Application("Google Chrome").windows[0].activeTab;
+}
+
+function runJS(js) {
+    return activeTab().execute({javascript: js});
+}
+
+function getURL() {
+    return activeTab().url();
+}
+
+function navigate(url) {
+    activeTab().url = url;
+}
+''' + ENSURE_STUDIO_JXA
+LIBRARY_CACHE_DIR = Path.home() / ".cache" / "vltrn"
+
+
+def compile_library() -> Optional[str]:
+    """Compile STUDIO_LIBRARY_SOURCE to a cached .scpt, once per source version"""
+    digest = hashlib.sha1(STUDIO_LIBRARY_SOURCE.encode()).hexdigest()[:12]
+    path = LIBRARY_CACHE_DIR / f"studio-jxa-{digest}.scpt"
+    if path.exists():
+        return str(path)
+    if not shutil.which("osacompile"):
+        return None
+
+    try:
+        LIBRARY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        source = path.with_suffix(".js")
+        source.write_text(STUDIO_LIBRARY_SOURCE)
+        result = subprocess.run(
+            ["osacompile", "-l", "JavaScript", "-o", str(path), str(source)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        source.unlink()
+    except OSError:
+        return None
+    return str(path) if result.returncode == 0 else None
+
+
+class OsascriptRunner(OsaRepl):
+    """The shared osascript REPL plus the compiled Chrome handler library
+
+    The REPL itself is AppleScript, but only as a dispatcher: JXA source runs
+    via `run script ... in "JavaScript"`, and call() runs the compiled JXA
+    library with `run script <file> with parameters`, so nothing is parsed
+    per call beyond that one line.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._library: Optional[str] = None
+        self._library_checked = False
+
+    @property
+    def library(self) -> Optional[str]:
+        """Path of the compiled handler library (compiled on first access)"""
+        if not self._library_checked:
+            self._library = compile_library()
+            self._library_checked = True
+        return self._library
+
+    def call(self, handler: str, *args: str) -> Optional[str]:
+        """Call a compiled library handler; None if the library is unavailable"""
+        if not self.library:
+            return None
+
+        script_file = f"POSIX file {applescript_string(self.library)}"
+        params = ", ".join(map(applescript_string, (handler, *args)))
+        result = self.send(f"run script ({script_file}) with parameters {{{params}}}")
+        if result is not None:
+            return result
+
+        # No REPL: run the compiled script directly, arguments through argv as-is
+        result = subprocess.run(
+            ["osascript", self.library, handler, *args],
+            capture_output=True,
+            text=True
+        )
+        return result.stdout.strip()
+
+
+_runner = OsascriptRunner()
+atexit.register(_runner.close)
+
+
+# Filter clauses in the automation layer (not the page): AppleScript `whose` /
+# `every ... where` and JXA `.whose(`. AppleScript is matched with its string
+# literals (e.g. page JS for `execute javascript`) blanked out, so words in
+# them don't count.
+_APPLESCRIPT_STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"')
+_APPLESCRIPT_FILTER_RE = re.compile(r'\bwhose\b|\bevery\b[^\n]*?\bwhere\b', re.IGNORECASE)
+_JXA_FILTER_RE = re.compile(r'\.whose\s*\(')
 
 
 def run_applescript(script: str) -> str:
     """Run an AppleScript and return the result"""
+    code = _APPLESCRIPT_STRING_RE.sub('""', script)
+    assert not _APPLESCRIPT_FILTER_RE.search(code), "use JS-side filtering, not whose/where"
+    result = _runner.run(script)
+    if result is not None:
+        return result
+
     result = subprocess.run(
         ["osascript", "-e", script],
         capture_output=True,
@@ -20,46 +166,165 @@ def run_applescript(script: str) -> str:
     return result.stdout.strip()
 
 
+def run_jxa(script: str) -> str:
+    """Run a JavaScript for Automation script and return the result"""
+    assert not _JXA_FILTER_RE.search(script), "use JS-side filtering, not .whose()"
+    result = _runner.run(script, "JavaScript")
+    if result is not None:
+        return result
+
+    result = subprocess.run(
+        ["osascript", "-l", "JavaScript", "-"],
+        input=script,
+        capture_output=True,
+        text=True
+    )
+    return result.stdout.strip()
+
+
+# Page-side helpers, installed on first use and after every reload. __vltrn.get
+# caches querySelectorAll results per selector for a short TTL; clicks go
+# through __vltrn.click, which drops the cache since the DOM is about to change.
+# __vltrn.findButton matches lowercased labels in a button index built in one
+# pass and thrown away (rebuilt lazily) whenever a MutationObserver sees the
+# DOM change; the same observer bumps __vltrn.rev, which memoized probes compare against.
+STUDIO_BOOTSTRAP_JS = '''
+if (!window.__vltrn) {
+    window.__vltrn = {
+        qsa: new Map(),
+        ttl: 150,
+        dirty: 0,
+        id: Math.random().toString(36).slice(2),
+        rev: 0,
+        buttonIndex: null,
+        trackIndex: null,
+        get: function(selector) {
+            var now = performance.now();
+            var hit = this.qsa.get(selector);
+            if (hit && now - hit.t < this.ttl) return hit.v;
+            var found = Array.from(document.querySelectorAll(selector));
+            this.qsa.set(selector, {v: found, t: now});
+            return found;
+        },
+        one: function(selector) {
+            return this.get(selector)[0] || null;
+        },
+        click: function(el) {
+            el.click();
+            this.qsa.clear();
+            this.dirty = performance.now();
+        },
+        buttons: function() {
+            if (!this.buttonIndex) {
+                var byText = new Map();
+                var list = [];
+                for (var btn of document.getElementsByTagName("button")) {
+                    // textContent, unlike innerText, reads without forcing layout;
+                    // the lowercased label is stamped once per index build
+                    btn.__t = btn.textContent.trim().toLowerCase();
+                    list.push(btn);
+                    if (!byText.has(btn.__t)) byText.set(btn.__t, btn);
+                }
+                this.buttonIndex = {byText: byText, list: list};
+            }
+            return this.buttonIndex;
+        },
+        tracks: function() {
+            // Per-track {solo, mute} controls, rebuilt after DOM changes
+            if (!this.trackIndex) {
+                var solo = "[aria-label*='solo' i], [data-testid*='solo']";
+                var mute = "[aria-label*='mute' i], [data-testid*='mute']";
+                var rows = document.querySelectorAll("[data-testid^='track-'], [class*='trackRow']");
+                var index = Array.from(rows, function(row) {
+                    return {solo: row.querySelector(solo), mute: row.querySelector(mute)};
+                }).filter(function(t) { return t.solo || t.mute; });
+                if (!index.length) {
+                    // No recognisable rows: pair the controls up in document order
+                    var solos = document.querySelectorAll(solo);
+                    var mutes = document.querySelectorAll(mute);
+                    for (var i = 0; i < Math.max(solos.length, mutes.length); i++) {
+                        index.push({solo: solos[i] || null, mute: mutes[i] || null});
+                    }
+                }
+                this.trackIndex = index;
+            }
+            return this.trackIndex;
+        },
+        findButton: function(text) {
+            // Whole-label match first, else the first button whose label contains it
+            var index = this.buttons();
+            var needle = text.trim().toLowerCase();
+            var exact = index.byText.get(needle);
+            if (exact) return exact;
+            for (var btn of index.list) {
+                if (btn.__t.includes(needle)) return btn;
+            }
+            return null;
+        },
+        waits: {},
+        waitFor: function(selector, timeoutMs, token) {
+            // "ready" once selector has matched, else "waiting". Only the
+            // observer queries the DOM; later polls just read its flag. Each
+            // wait has its caller's token, so a later call never reads an old
+            // answer; the timer disconnects the observer and drops the entry
+            var waits = this.waits;
+            var w = waits[token];
+            if (w) return w.ready ? "ready" : "waiting";
+            if (document.querySelector(selector)) return "ready";
+            w = waits[token] = {ready: false};
+            var mo = new MutationObserver(function() {
+                if (document.querySelector(selector)) {
+                    w.ready = true;
+                    mo.disconnect();
+                }
+            });
+            mo.observe(document.body, {childList: true, subtree: true});
+            setTimeout(function() {
+                mo.disconnect();
+                delete waits[token];
+            }, timeoutMs || 2000);
+            return "waiting";
+        }
+    };
+    new MutationObserver(function() {
+        window.__vltrn.buttonIndex = null;
+        window.__vltrn.trackIndex = null;
+        window.__vltrn.rev++;
+    }).observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true, attributeFilter: ["href"]});
+}
+'''
+
+
 def run_js(js_code: str) -> str:
     """Execute JavaScript in Chrome's active tab"""
-    escaped_js = js_code.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-    script = f'''
-    tell application "Google Chrome"
-        tell active tab of front window
-            execute javascript "{escaped_js}"
-        end tell
-    end tell
-    '''
-    return run_applescript(script)
+    js_code = STUDIO_BOOTSTRAP_JS + js_code
+    result = _runner.call("runJS", js_code)
+    if result is not None:
+        return result
+    return run_jxa(f'Application("Google Chrome").windows[0].activeTab.execute({{javascript: {json.dumps(js_code)}}})')
 
 
 def get_url() -> str:
     """Get current Chrome URL"""
-    script = '''
-    tell application "Google Chrome"
-        get URL of active tab of front window
-    end tell
-    '''
-    return run_applescript(script)
+    result = _runner.call("getURL")
+    if result is not None:
+        return result
+    return run_jxa('Application("Google Chrome").windows[0].activeTab.url()')
 
 
 def navigate(url: str):
     """Navigate Chrome to URL"""
-    script = f'''
-    tell application "Google Chrome"
-        set URL of active tab of front window to "{url}"
-    end tell
-    '''
-    run_applescript(script)
+    if _runner.call("navigate", url) is None:
+        run_jxa(f'Application("Google Chrome").windows[0].activeTab.url = {json.dumps(url)}')
 
 
 def click_element(selector: str) -> bool:
     """Click an element by CSS selector"""
     js = f'''
     (function() {{
-        var el = document.querySelector("{selector}");
+        var el = __vltrn.one("{selector}");
         if (el) {{
-            el.click();
+            __vltrn.click(el);
             return "clicked";
         }}
         return "not found";
@@ -73,12 +338,10 @@ def click_button_by_text(text: str) -> bool:
     """Click a button containing specific text"""
     js = f'''
     (function() {{
-        var buttons = document.querySelectorAll("button");
-        for (var btn of buttons) {{
-            if (btn.textContent.includes("{text}")) {{
-                btn.click();
-                return "clicked: " + btn.textContent.trim();
-            }}
+        var btn = __vltrn.findButton({json.dumps(text)});
+        if (btn) {{
+            __vltrn.click(btn);
+            return "clicked: " + btn.textContent.trim();
         }}
         return "not found";
     }})()
@@ -87,79 +350,306 @@ def click_button_by_text(text: str) -> bool:
     return "clicked" in result
 
 
+def _poll_ready(js: str, timeout: float, interval: float = 0.1) -> bool:
+    """Poll a page expression that answers "ready" / "waiting" until ready or timeout"""
+    deadline = time.time() + timeout
+    while True:
+        if run_js(js) == "ready":
+            return True
+        if time.time() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def _wait_token() -> str:
+    """Fresh key for one __vltrn.waitFor wait"""
+    return json.dumps(uuid.uuid4().hex)
+
+
+def wait_for_selector(selector: str, timeout: float = 2.0) -> bool:
+    """Wait until selector matches something in the page
+
+    A MutationObserver in the page flags the match as soon as it appears;
+    each poll is only a cheap read of that flag.
+    """
+    js = f"__vltrn.waitFor({json.dumps(selector)}, {int(timeout * 1000)}, {_wait_token()})"
+    return _poll_ready(js, timeout)
+
+
+STUDIO_READY_FN = '''
+function(timeoutMs, token) {
+    if (!location.pathname.startsWith("/studio") || document.readyState === "loading") {
+        return "waiting";
+    }
+    return __vltrn.waitFor("[class*='track'], [data-testid*='track'], [class*='bpm']", timeoutMs, token);
+}
+'''
+
+
+# Page-side probes as function expressions returning plain values, so the
+# single-purpose getters and the bulk snapshot share the same code
+STUDIO_STATE_FN = '''
+function() {
+    var state = {
+        bpm: null,
+        tracks: 0,
+        position: null,
+        hasProject: false
+    };
+
+    // Find BPM
+    var bpmEl = __vltrn.one("[class*='bpm'], [data-testid*='bpm']");
+    if (bpmEl) {
+        var match = bpmEl.textContent.match(/(\\d+)\\s*BPM/i);
+        if (match) state.bpm = parseInt(match[1]);
+    }
+
+    // Count tracks
+    var tracks = __vltrn.get("[class*='track'], [data-testid*='track']");
+    state.tracks = tracks.length;
+
+    // Check for project: a specific element, not a body.innerText reflow
+    state.hasProject = !!(
+        __vltrn.one("[data-testid*='project'], button[aria-label*='Export'], header [class*='Untitled']") ||
+        __vltrn.buttons().byText.has("export")
+    );
+
+    return state;
+}
+'''
+
+LIBRARY_SONGS_FN = '''
+function() {
+    var songs = [];
+    var links = __vltrn.get("a[href*='/song/']");
+    var seen = {};
+
+    for (var link of links) {
+        var href = link.href;
+        var match = href.match(/\\/song\\/([a-f0-9-]+)/);
+        if (match && !seen[match[1]]) {
+            seen[match[1]] = true;
+            songs.push({
+                id: match[1],
+                title: link.textContent.trim().substring(0, 50),
+                url: href
+            });
+        }
+    }
+
+    return songs.slice(0, 20);
+}
+'''
+
+TRACKS_INFO_FN = '''
+function() {
+    var tracks = [];
+    var trackElements = __vltrn.get("[class*='track'], [role='row']");
+
+    for (var i = 0; i < trackElements.length; i++) {
+        var track = trackElements[i];
+        var text = track.textContent.trim().substring(0, 100);
+        if (text.length > 0) {
+            tracks.push({
+                index: i,
+                content: text
+            });
+        }
+    }
+
+    return tracks.slice(0, 10);
+}
+'''
+
+# Runs each probe whose cached value is missing or older than the page's
+# current rev; the id part changes on reload, when rev starts over
+MEMO_SNAPSHOT_FN = '''
+function(lastRev, cached, probes) {
+    var rev = __vltrn.id + ":" + __vltrn.rev;
+    var values = {};
+    for (var name in probes) {
+        if (rev === lastRev && cached.indexOf(name) !== -1) continue;
+        values[name] = probes[name]();
+    }
+    return {rev: rev, values: values};
+}
+'''
+
+SNAPSHOT_FNS = {
+    "state": STUDIO_STATE_FN,
+    "tracks": TRACKS_INFO_FN,
+    "songs": LIBRARY_SONGS_FN
+}
+SNAPSHOT_FIELDS = tuple(SNAPSHOT_FNS)
+
+# Last probe results, valid as long as the page is still at _snapshot_rev
+_snapshot: Dict[str, Any] = {}
+_snapshot_rev = ""
+
+
+def get_bulk_snapshot(fields: Tuple[str, ...] = SNAPSHOT_FIELDS) -> Dict[str, Any]:
+    """State, tracks and/or songs from one JS call
+
+    Fields read since the DOM last changed come from the cache; the page
+    only re-runs the probes for the rest.
+    """
+    global _snapshot, _snapshot_rev
+    probes = ", ".join(f"{f}: {SNAPSHOT_FNS[f]}" for f in fields)
+    cached = json.dumps([f for f in fields if f in _snapshot])
+    result = run_js(f"JSON.stringify(({MEMO_SNAPSHOT_FN})({json.dumps(_snapshot_rev)}, {cached}, {{{probes}}}))")
+    try:
+        reply = json.loads(result)
+    except:
+        return {"error": result}
+
+    if reply["rev"] != _snapshot_rev:
+        _snapshot, _snapshot_rev = {}, reply["rev"]
+    _snapshot.update(reply["values"])
+    return {f: _snapshot.get(f) for f in fields}
+
+
 def get_studio_state() -> Dict[str, Any]:
     """Get current Studio state"""
-    js = '''
-    (function() {
-        var state = {
-            bpm: null,
-            tracks: 0,
-            position: null,
-            hasProject: false
-        };
-
-        // Find BPM
-        var bpmEl = document.querySelector("[class*='bpm'], [data-testid*='bpm']");
-        if (bpmEl) {
-            var match = bpmEl.textContent.match(/(\\d+)\\s*BPM/i);
-            if (match) state.bpm = parseInt(match[1]);
-        }
+    snapshot = get_bulk_snapshot(("state",))
+    return snapshot.get("state") or {"error": snapshot.get("error", "no result")}
 
-        // Count tracks
-        var tracks = document.querySelectorAll("[class*='track'], [data-testid*='track']");
-        state.tracks = tracks.length;
 
-        // Check for project
-        if (document.body.innerText.includes("Untitled Project") ||
-            document.body.innerText.includes("Export")) {
-            state.hasProject = true;
-        }
+STUDIO_URL = "https://suno.com/studio"
 
-        return JSON.stringify(state);
-    })()
-    '''
-    result = run_js(js)
+
+def ensure_studio_and_snapshot(timeout: float = 3.0) -> Dict[str, Any]:
+    """Navigate to Studio if needed and return {url, navigated, state}
+
+    The URL check, navigation, readiness polling and state probe all run
+    inside one JXA call instead of one osascript round-trip each.
+    """
+    ready_js = STUDIO_BOOTSTRAP_JS + f"({STUDIO_READY_FN})({int(timeout * 1000)}, {_wait_token()})"
+    state_js = STUDIO_BOOTSTRAP_JS + f"JSON.stringify(({STUDIO_STATE_FN})())"
+    args = (STUDIO_URL, ready_js, state_js, str(timeout))
+    result = _runner.call("ensureStudio", *args)
+    if result is None:
+        result = run_jxa(ENSURE_STUDIO_JXA + f"ensureStudio({', '.join(json.dumps(a) for a in args)})")
     try:
-        return json.loads(result)
+        studio = json.loads(result)
     except:
-        return {"error": result}
+        return {"url": "", "navigated": False, "state": {"error": result}}
+    studio["state"] = studio.get("state") or {"error": "no result"}
+    return studio
+
+
+# Mutating commands as function expressions returning a status string, so the
+# single commands and apply_ops batches run the same page code
+BPM_OPEN_FN = '''
+function() {
+    // Try to find and click BPM element
+    var bpmElements = __vltrn.get("[class*='bpm'], button");
+    for (var el of bpmElements) {
+        if (el.textContent.includes("BPM")) {
+            __vltrn.click(el);
+            return "clicked bpm";
+        }
+    }
+    return "bpm not found";
+}
+'''
+
+BPM_INPUT_SELECTOR = "input[type='number']"
+
+BPM_SET_FN = '''
+function(bpm) {
+    var inputs = __vltrn.get("input[type='number'], input");
+    for (var inp of inputs) {
+        if (inp.offsetParent !== null) {
+            inp.value = String(bpm);
+            inp.dispatchEvent(new Event("input", { bubbles: true }));
+            inp.dispatchEvent(new Event("change", { bubbles: true }));
+            return "set to " + bpm;
+        }
+    }
+    return "no input found";
+}
+'''
+
+SOLO_TRACK_FN = '''
+function(trackIndex) {
+    var track = __vltrn.tracks()[trackIndex];
+    if (track && track.solo) {
+        __vltrn.click(track.solo);
+        return "soloed track " + trackIndex;
+    }
+    return "solo button not found";
+}
+'''
+
+MUTE_TRACK_FN = '''
+function(trackIndex) {
+    var track = __vltrn.tracks()[trackIndex];
+    if (track && track.mute) {
+        __vltrn.click(track.mute);
+        return "muted track " + trackIndex;
+    }
+    return "mute button not found";
+}
+'''
+
+PLAY_FN = '''
+function() {
+    var playBtn = __vltrn.one("[aria-label*='Play'], [class*='play']");
+    if (playBtn) {
+        __vltrn.click(playBtn);
+        return "playing";
+    }
+    return "play not found";
+}
+'''
+
+STOP_FN = '''
+function() {
+    var stopBtn = __vltrn.one("[aria-label*='Stop'], [aria-label*='Pause']");
+    if (stopBtn) {
+        __vltrn.click(stopBtn);
+        return "stopped";
+    }
+    return "stop not found";
+}
+'''
+
+# Runs [{op, args}, ...] in order against the handlers above
+APPLY_OPS_FN = '''
+function(ops, handlers) {
+    var results = [];
+    for (var o of ops) {
+        var handler = handlers[o.op];
+        results.push(handler ? handler.apply(null, o.args || []) : "unknown op " + o.op);
+    }
+    return results;
+}
+'''
+
+OP_HANDLERS_JS = (
+    f"{{bpm_open: {BPM_OPEN_FN}, bpm_set: {BPM_SET_FN}, solo: {SOLO_TRACK_FN}, "
+    f"mute: {MUTE_TRACK_FN}, play: {PLAY_FN}, stop: {STOP_FN}}}"
+)
+
+# Status prefix each op reports on success
+OP_SUCCESS = {
+    "bpm_open": "clicked",
+    "bpm_set": "set to",
+    "solo": "soloed",
+    "mute": "muted",
+    "play": "playing",
+    "stop": "stopped"
+}
 
 
 def set_bpm(bpm: int) -> bool:
     """Set the project BPM"""
-    js = f'''
-    (function() {{
-        // Try to find and click BPM element
-        var bpmElements = document.querySelectorAll("[class*='bpm'], button");
-        for (var el of bpmElements) {{
-            if (el.textContent.includes("BPM")) {{
-                el.click();
-                return "clicked bpm";
-            }}
-        }}
-        return "bpm not found";
-    }})()
-    '''
-    result = run_js(js)
+    result = run_js(f"({BPM_OPEN_FN})()")
 
     if "clicked" in result:
-        time.sleep(0.5)
-        # Try to input the new BPM
-        js_input = f'''
-        (function() {{
-            var inputs = document.querySelectorAll("input[type='number'], input");
-            for (var inp of inputs) {{
-                if (inp.offsetParent !== null) {{
-                    inp.value = "{bpm}";
-                    inp.dispatchEvent(new Event("input", {{ bubbles: true }}));
-                    inp.dispatchEvent(new Event("change", {{ bubbles: true }}));
-                    return "set to {bpm}";
-                }}
-            }}
-            return "no input found";
-        }})()
-        '''
-        result = run_js(js_input)
+        # Give the BPM field a moment to appear, then input the new BPM
+        wait_for_selector(BPM_INPUT_SELECTOR, timeout=0.5)
+        result = run_js(f"({BPM_SET_FN})({bpm})")
         return "set to" in result
     return False
 
@@ -181,33 +671,7 @@ def create_song() -> bool:
 
 def get_library_songs() -> List[Dict[str, str]]:
     """Get songs available in the library"""
-    js = '''
-    (function() {
-        var songs = [];
-        var links = document.querySelectorAll("a[href*='/song/']");
-        var seen = {};
-
-        for (var link of links) {
-            var href = link.href;
-            var match = href.match(/\\/song\\/([a-f0-9-]+)/);
-            if (match && !seen[match[1]]) {
-                seen[match[1]] = true;
-                songs.push({
-                    id: match[1],
-                    title: link.textContent.trim().substring(0, 50),
-                    url: href
-                });
-            }
-        }
-
-        return JSON.stringify(songs.slice(0, 20));
-    })()
-    '''
-    result = run_js(js)
-    try:
-        return json.loads(result)
-    except:
-        return []
+    return get_bulk_snapshot(("songs",)).get("songs") or []
 
 
 def import_song_to_track(song_id: str) -> bool:
@@ -217,22 +681,22 @@ def import_song_to_track(song_id: str) -> bool:
         print("Could not open library")
         return False
 
-    time.sleep(1)
+    wait_for_selector(f"a[href*='/song/{song_id}'], [data-id='{song_id}']", timeout=2)
 
     # Find and click the song
     js = f'''
     (function() {{
-        var links = document.querySelectorAll("a[href*='/song/{song_id}'], [data-id='{song_id}']");
+        var links = __vltrn.get("a[href*='/song/{song_id}'], [data-id='{song_id}']");
         for (var link of links) {{
-            link.click();
+            __vltrn.click(link);
             return "clicked song";
         }}
 
         // Try finding by partial ID
-        var allLinks = document.querySelectorAll("a[href*='/song/']");
+        var allLinks = __vltrn.get("a[href*='/song/']");
         for (var link of allLinks) {{
             if (link.href.includes("{song_id.split('-')[0]}")) {{
-                link.click();
+                __vltrn.click(link);
                 return "clicked song (partial match)";
             }}
         }}
@@ -246,75 +710,18 @@ def import_song_to_track(song_id: str) -> bool:
 
 def get_tracks_info() -> List[Dict[str, Any]]:
     """Get information about tracks in the project"""
-    js = '''
-    (function() {
-        var tracks = [];
-        var trackElements = document.querySelectorAll("[class*='track'], [role='row']");
-
-        for (var i = 0; i < trackElements.length; i++) {
-            var track = trackElements[i];
-            var text = track.textContent.trim().substring(0, 100);
-            if (text.length > 0) {
-                tracks.push({
-                    index: i,
-                    content: text
-                });
-            }
-        }
-
-        return JSON.stringify(tracks.slice(0, 10));
-    })()
-    '''
-    result = run_js(js)
-    try:
-        return json.loads(result)
-    except:
-        return []
+    return get_bulk_snapshot(("tracks",)).get("tracks") or []
 
 
 def solo_track(track_index: int) -> bool:
     """Solo a specific track"""
-    js = f'''
-    (function() {{
-        var soloButtons = document.querySelectorAll("[aria-label*='solo'], [class*='solo'], button");
-        var count = 0;
-        for (var btn of soloButtons) {{
-            if (btn.textContent.toLowerCase().includes("s") ||
-                btn.getAttribute("aria-label")?.toLowerCase().includes("solo")) {{
-                if (count === {track_index}) {{
-                    btn.click();
-                    return "soloed track " + {track_index};
-                }}
-                count++;
-            }}
-        }}
-        return "solo button not found";
-    }})()
-    '''
-    result = run_js(js)
+    result = run_js(f"({SOLO_TRACK_FN})({track_index})")
     return "soloed" in result
 
 
 def mute_track(track_index: int) -> bool:
     """Mute a specific track"""
-    js = f'''
-    (function() {{
-        var muteButtons = document.querySelectorAll("[aria-label*='mute'], [class*='mute'], button");
-        var count = 0;
-        for (var btn of muteButtons) {{
-            if (btn.textContent.toLowerCase().includes("m") ||
-                btn.getAttribute("aria-label")?.toLowerCase().includes("mute")) {{
-                if (count === {track_index}) {{
-                    btn.click();
-                    return "muted track " + {track_index};
-                }}
-                count++;
-            }}
-        }}
-        return "mute button not found";
-    }})()
-    '''
-    result = run_js(js)
+    result = run_js(f"({MUTE_TRACK_FN})({track_index})")
     return "muted" in result
 
 
@@ -325,51 +732,88 @@ def export_project() -> bool:
 
 def play_project() -> bool:
     """Start playback"""
-    js = '''
-    (function() {
-        var playBtn = document.querySelector("[aria-label*='Play'], [class*='play']");
-        if (playBtn) {
-            playBtn.click();
-            return "playing";
-        }
-        return "play not found";
-    })()
-    '''
-    result = run_js(js)
+    result = run_js(f"({PLAY_FN})()")
     return "playing" in result
 
 
 def stop_project() -> bool:
     """Stop playback"""
-    js = '''
-    (function() {
-        var stopBtn = document.querySelector("[aria-label*='Stop'], [aria-label*='Pause']");
-        if (stopBtn) {
-            stopBtn.click();
-            return "stopped";
-        }
-        return "stop not found";
-    })()
-    '''
-    result = run_js(js)
+    result = run_js(f"({STOP_FN})()")
     return "stopped" in result
 
 
-def interactive_studio():
-    """Interactive studio control mode"""
+def _run_ops(ops: List[Dict[str, Any]]) -> List[str]:
+    """One run_js for a list of page-side ops; their status strings in order"""
+    result = run_js(f"JSON.stringify(({APPLY_OPS_FN})({json.dumps(ops)}, {OP_HANDLERS_JS}))")
+    try:
+        return json.loads(result)
+    except:
+        return [result] * len(ops)
+
+
+def apply_ops(ops: List[Dict[str, Any]]) -> List[bool]:
+    """Apply mute/solo/bpm/play/stop ops ({"op", "args"}) in as few round-trips as possible
+
+    Everything up to a bpm change goes in one JS call; the BPM field needs a
+    moment to appear after its button is clicked, so the value (and the ops
+    after it) follow in the next call once the field is there.
+    """
+    page_ops: List[Dict[str, Any]] = []
+    for op in ops:
+        if op["op"] == "bpm":
+            page_ops.append({"op": "bpm_open", "args": []})
+            page_ops.append({"op": "bpm_set", "args": list(op.get("args", []))})
+        else:
+            page_ops.append({"op": op["op"], "args": list(op.get("args", []))})
+
+    statuses: List[str] = []
+    pending: List[Dict[str, Any]] = []
+    for op in page_ops:
+        if op["op"] == "bpm_set":
+            statuses += _run_ops(pending)
+            pending = []
+            if not statuses[-1].startswith(OP_SUCCESS["bpm_open"]):
+                statuses.append("bpm not found")
+                continue
+            wait_for_selector(BPM_INPUT_SELECTOR, timeout=0.5)
+        pending.append(op)
+    if pending:
+        statuses += _run_ops(pending)
+
+    results: List[bool] = []
+    for op, status in zip(page_ops, statuses):
+        if op["op"] == "bpm_open":
+            continue
+        prefix = OP_SUCCESS.get(op["op"])
+        results.append(bool(prefix) and status.startswith(prefix))
+    return results
+
+
+def parse_ops(text: str) -> List[Dict[str, Any]]:
+    """Parse 'mute 1; solo 3; bpm 128; play' into apply_ops entries"""
+    ops = []
+    for part in text.split(";"):
+        words = part.split()
+        if not words:
+            continue
+        if words[0] not in ("mute", "solo", "bpm", "play", "stop"):
+            raise ValueError(f"unknown op: {words[0]}")
+        ops.append({"op": words[0], "args": [int(w) for w in words[1:]]})
+    return ops
+
+
+def interactive_studio(studio: Optional[Dict[str, Any]] = None):
+    """Interactive studio control mode; studio is a prior ensure_studio_and_snapshot()"""
     print("\n" + "="*60)
     print("VLTRN SUNO Studio Controller")
     print("="*60)
 
-    # Check we're in Studio
-    url = get_url()
-    if "studio" not in url:
-        print("Navigating to Studio...")
-        navigate("https://suno.com/studio")
-        time.sleep(3)
-
-    # Get initial state
-    state = get_studio_state()
+    # Make sure we're in Studio and get the initial state
+    if studio is None:
+        studio = ensure_studio_and_snapshot()
+        if studio["navigated"]:
+            print("Navigated to Studio")
+    state = studio["state"]
     print(f"\nStudio State:")
     print(f"  BPM: {state.get('bpm', 'Unknown')}")
     print(f"  Tracks: {state.get('tracks', 0)}")
@@ -388,6 +832,7 @@ def interactive_studio():
     print("  play        - Start playback")
     print("  stop        - Stop playback")
     print("  export      - Export project")
+    print("  batch <ops> - Run ops in one go, e.g. batch mute 1; solo 3; bpm 128")
     print("  quit        - Exit")
 
     while True:
@@ -400,7 +845,7 @@ def interactive_studio():
             if action == "quit" or action == "exit":
                 break
 
-            elif action == "state":
+            if action == "state":
                 state = get_studio_state()
                 print(json.dumps(state, indent=2))
 
@@ -500,6 +945,19 @@ def interactive_studio():
                 else:
                     print("Could not open export")
 
+            elif action == "batch":
+                if args:
+                    try:
+                        ops = parse_ops(args)
+                    except ValueError as e:
+                        print(f"Invalid batch: {e}")
+                        ops = []
+                    for op, ok in zip(ops, apply_ops(ops)):
+                        label = " ".join([op["op"], *map(str, op["args"])])
+                        print(f"  {label}: {'ok' if ok else 'failed'}")
+                else:
+                    print("Usage: batch <op> [n]; <op> [n]; ...")
+
             elif action == "create":
                 if create_song():
                     print("Create Song clicked")
@@ -524,24 +982,19 @@ def main():
     print("VLTRN SUNO Studio Mixer")
     print("="*60)
 
-    # Check Chrome connection
-    try:
-        url = get_url()
-        print(f"Connected to Chrome: {url}")
-    except Exception as e:
-        print(f"Error: Could not connect to Chrome: {e}")
+    # Check Chrome connection, navigating to Studio if needed
+    studio = ensure_studio_and_snapshot()
+    if not studio["url"]:
+        print(f"Error: Could not connect to Chrome: {studio['state'].get('error')}")
         print("\nMake sure Chrome is running and AppleScript is enabled:")
         print("View > Developer > Allow JavaScript from Apple Events")
         return
-
-    # Navigate to Studio if needed
-    if "studio" not in url:
-        print("\nNavigating to SUNO Studio...")
-        navigate("https://suno.com/studio")
-        time.sleep(3)
+    if studio["navigated"]:
+        print("\nNavigated to SUNO Studio")
+    print(f"Connected to Chrome: {studio['url']}")
 
     # Start interactive mode
-    interactive_studio()
+    interactive_studio(studio)
 
 
 if __name__ == "__main__":